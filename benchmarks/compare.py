@@ -0,0 +1,48 @@
+"""Compare two benchmark result files stage by stage.
+
+    python -m benchmarks.compare OLD.json NEW.json [--threshold 0.1]
+
+Exits non-zero when any stage got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown that counts as a regression (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    old, new = load(args.old), load(args.new)
+    old_rows = {(r["size"], r["stage"]): r for r in old["results"]}
+
+    print(f"old: {old.get('commit')}  new: {new.get('commit')}")
+    print(f"{'size':>8} {'stage':<22} {'old ms':>10} {'new ms':>10} {'speedup':>8}  entities")
+    regressions = 0
+    for row in new["results"]:
+        before = old_rows.get((row["size"], row["stage"]))
+        if before is None:
+            continue
+        speedup = before["min_s"] / row["min_s"] if row["min_s"] else float("inf")
+        flag = ""
+        if speedup < 1 / (1 + args.threshold):
+            flag = "  <-- slower"
+            regressions += 1
+        entities = f"{before['entities']} -> {row['entities']}" if before["entities"] != row["entities"] else row["entities"]
+        print(f"{row['size']:>8} {row['stage']:<22} {before['min_s'] * 1000:>10.1f} {row['min_s'] * 1000:>10.1f}"
+              f" {speedup:>7.2f}x  {entities}{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
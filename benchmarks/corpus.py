@@ -0,0 +1,248 @@
+"""Seeded generator of synthetic Indian legal documents for benchmarking the extractors.
+
+    python -m benchmarks.corpus out_dir --sizes 10KB 1MB 100MB --seed 7
+"""
+import argparse
+import os
+import random
+import re
+import string
+from typing import Dict, Iterator, List
+
+# Expected occurrences of each entity kind per 1,000 characters of text
+DEFAULT_DENSITIES: Dict[str, float] = {
+    "pan": 0.3,
+    "gstin": 0.3,
+    "ifsc": 0.2,
+    "account": 0.2,
+    "mobile": 0.4,
+    "mobile_split": 0.15,
+    "landline": 0.2,
+    "passport": 0.1,
+    "email": 0.3,
+    "act": 0.5,
+    "company": 0.4,
+    "person": 0.8,
+    "address": 0.25,
+}
+
+GIVEN_NAMES = [
+    "Rajesh", "Suresh", "Anil", "Sunita", "Priya", "Ramesh", "Kavita", "Vikram", "Deepak", "Meena",
+    "Arjun", "Lakshmi", "Mohan", "Anita", "Sanjay", "Pooja", "Harish", "Geeta", "Manoj", "Rekha",
+]
+SURNAMES = [
+    "Sharma", "Verma", "Gupta", "Iyer", "Reddy", "Nair", "Patel", "Singh", "Kumar", "Mehta",
+    "Rao", "Joshi", "Chatterjee", "Banerjee", "Pillai", "Agarwal", "Desai", "Kulkarni", "Yadav", "Menon",
+]
+HONORIFICS = ["Shri", "Smt.", "Sh.", "Mr.", "Dr.", "Ms."]
+COMPANY_WORDS = ["Shree", "Ganesh", "Bharat", "Sai", "Lakshmi", "Everest", "Sunrise", "Metro", "Apex", "Vijay"]
+COMPANY_KINDS = ["Enterprises", "Industries", "Exports", "Cement", "Technologies", "Traders", "Textiles"]
+COMPANY_SUFFIXES = ["Pvt. Ltd.", "Private Limited", "LLP", "Limited"]
+ACTS = [
+    ("15", "Foreign Trade (Development & Regulation)", "Act", "1992"),
+    ("11(2)", "Foreign Trade (Development & Regulation)", "Act", "1992"),
+    ("138", "Negotiable Instruments", "Act", "1881"),
+    ("420", "Indian Penal", "Code", ""),
+    ("132", "Central Goods and Services Tax", "Act", "2017"),
+    ("7", "Prevention of Money Laundering", "Act", "2002"),
+]
+CITIES = [
+    ("Bengaluru", "Bengaluru Urban", "Karnataka", "560034"),
+    ("Chennai", "Chennai", "Tamil Nadu", "600001"),
+    ("Mumbai", "Mumbai Suburban", "Maharashtra", "400051"),
+    ("New Delhi", "New Delhi", "Delhi", "110001"),
+    ("Kolkata", "Kolkata", "West Bengal", "700001"),
+    ("Hyderabad", "Hyderabad", "Telangana", "500001"),
+]
+STREETS = ["MG Road", "17th Main Road", "Station Road", "Nehru Street", "Gandhi Nagar", "Park Street"]
+BANK_CODES = ["SBIN", "HDFC", "ICIC", "UTIB", "PUNB", "CNRB", "BARB", "KKBK"]
+STATE_CODES = ["29", "33", "27", "07", "19", "36"]
+EMAIL_DOMAINS = ["gmail.com", "nic.in", "yahoo.co.in", "company.com", "gov.in"]
+
+FILLER = [
+    "The appellant has filed the present appeal against the impugned order.",
+    "Having heard both parties and perused the records, the following order is passed.",
+    "The respondent failed to fulfil the export obligation within the stipulated period.",
+    "A show cause notice was issued and served on the noticee at the address on record.",
+    "No reply was received within the time allowed, and no personal hearing was sought.",
+    "The authorisation holder is liable to pay the duty saved along with interest.",
+    "Accordingly, the penalty imposed is upheld and the appeal stands disposed of.",
+    "Copy of this order is forwarded to the concerned authorities for information.",
+]
+
+GSTIN_CHARS = string.digits + string.ascii_uppercase
+
+
+def gstin_check_char(first14: str) -> str:
+    """Mod-36 check character of a GSTIN (alternating weights 1, 2 with carry folding)."""
+    total = 0
+    for i, ch in enumerate(first14):
+        product = GSTIN_CHARS.index(ch) * (2 if i % 2 else 1)
+        total += product // 36 + product % 36
+    return GSTIN_CHARS[(36 - total % 36) % 36]
+
+
+class DocumentGenerator:
+    """Produces synthetic legal text with entities mixed in at the requested densities."""
+
+    def __init__(self, seed: int = 0, densities: Dict[str, float] = None):
+        self.rng = random.Random(seed)
+        self.densities = dict(DEFAULT_DENSITIES, **(densities or {}))
+
+    def pan(self, entity_type: str = None) -> str:
+        r = self.rng
+        letters = "".join(r.choice(string.ascii_uppercase) for _ in range(3))
+        entity_type = entity_type or r.choice("PCHFATBLJG")
+        return f"{letters}{entity_type}{r.choice(string.ascii_uppercase)}{r.randint(1, 9999):04d}{r.choice(string.ascii_uppercase)}"
+
+    def gstin(self) -> str:
+        body = f"{self.rng.choice(STATE_CODES)}{self.pan()}{self.rng.randint(1, 9)}Z"
+        return body + gstin_check_char(body)
+
+    def ifsc(self) -> str:
+        return f"{self.rng.choice(BANK_CODES)}0{self.rng.randint(0, 999999):06d}"
+
+    def account(self) -> str:
+        return str(self.rng.randint(10 ** 10, 10 ** 16 - 1))
+
+    def mobile(self, split: bool = False) -> str:
+        r = self.rng
+        digits = f"{r.choice('6789')}{r.randint(0, 999999999):09d}"
+        prefix = r.choice(["", "+91 ", "0", "+91-"])
+        if split:
+            return f"{prefix}{digits[:5]} {digits[5:]}"
+        return prefix + digits
+
+    def landline(self) -> str:
+        code = self.rng.choice(["080", "044", "022", "011", "033", "040"])
+        return f"{code}-{self.rng.randint(20000000, 29999999)}"
+
+    def passport(self) -> str:
+        return f"{self.rng.choice('ABCDEFGHJKLMNPRSTUVWY')}{self.rng.randint(1000000, 9999999)}"
+
+    def person(self) -> str:
+        r = self.rng
+        return f"{r.choice(HONORIFICS)} {r.choice(GIVEN_NAMES)} {r.choice(SURNAMES)}"
+
+    def company(self) -> str:
+        r = self.rng
+        return f"M/s. {r.choice(COMPANY_WORDS)} {r.choice(COMPANY_KINDS)} {r.choice(COMPANY_SUFFIXES)}"
+
+    def email(self) -> str:
+        r = self.rng
+        return f"{r.choice(GIVEN_NAMES).lower()}.{r.choice(SURNAMES).lower()}{r.randint(1, 99)}@{r.choice(EMAIL_DOMAINS)}"
+
+    def act(self) -> str:
+        section, name, kind, year = self.rng.choice(ACTS)
+        return f"Section {section} of the {name} {kind}{', ' + year if year else ''}"
+
+    def address(self) -> str:
+        r = self.rng
+        city, district, state, pin = r.choice(CITIES)
+        return (f"No. {r.randint(1, 400)}, {r.choice(STREETS)},\n{city}, District {district},\n"
+                f"{state} - {pin}")
+
+    def sentence(self) -> str:
+        """One filler sentence, with entities dropped in according to the densities."""
+        r = self.rng
+        base = r.choice(FILLER)
+        # Densities are per 1,000 characters; a filler sentence is roughly 80 characters
+        scale = len(base) / 1000
+        parts = [base]
+        for kind, density in self.densities.items():
+            expected = density * scale
+            while expected > 0:
+                if r.random() < min(expected, 1.0):
+                    parts.append(self.entity_phrase(kind))
+                expected -= 1.0
+        return " ".join(parts)
+
+    def entity_phrase(self, kind: str) -> str:
+        if kind == "pan":
+            return f"PAN: {self.pan()}."
+        if kind == "gstin":
+            return f"GSTIN {self.gstin()} is registered."
+        if kind == "ifsc":
+            return f"IFSC Code {self.ifsc()}."
+        if kind == "account":
+            return f"A/c No. {self.account()}."
+        if kind == "mobile":
+            return f"Mobile: {self.mobile()}."
+        if kind == "mobile_split":
+            return f"Contact {self.mobile(split=True)}."
+        if kind == "landline":
+            return f"Phone Office: {self.landline()}"
+        if kind == "passport":
+            return f"Passport No. {self.passport()}."
+        if kind == "email":
+            return f"Email: {self.email()}"
+        if kind == "act":
+            return f"The order is passed under {self.act()}."
+        if kind == "company":
+            return f"{self.company()} was represented by counsel."
+        if kind == "person":
+            return f"{self.person()} appeared for the party."
+        if kind == "address":
+            return f"\n{self.address()}\n"
+        raise ValueError(f"Unknown entity kind: {kind}")
+
+    def iter_text(self, size_chars: int) -> Iterator[str]:
+        """Yield paragraphs until about ``size_chars`` characters have been produced."""
+        produced = 0
+        while produced < size_chars:
+            paragraph = " ".join(self.sentence() for _ in range(self.rng.randint(3, 8))) + "\n\n"
+            produced += len(paragraph)
+            yield paragraph
+
+    def document(self, size_chars: int) -> str:
+        return "".join(self.iter_text(size_chars))
+
+    def write(self, path: str, size_chars: int):
+        with open(path, "w", encoding="utf-8") as f:
+            for paragraph in self.iter_text(size_chars):
+                f.write(paragraph)
+
+
+SIZE_REGEX = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$", re.IGNORECASE)
+
+
+def parse_size(size: str) -> int:
+    """'512', '10KB', '1.5MB' -> number of characters."""
+    match = SIZE_REGEX.match(size)
+    if not match:
+        raise ValueError(f"Bad size: {size}")
+    number, unit = float(match.group(1)), match.group(2).upper().rstrip("B")
+    return int(number * {"": 1, "K": 2**10, "M": 2**20, "G": 2**30}[unit])
+
+
+def parse_densities(pairs: List[str]) -> Dict[str, float]:
+    densities = {}
+    for pair in pairs or []:
+        kind, _, value = pair.partition("=")
+        if kind not in DEFAULT_DENSITIES:
+            raise ValueError(f"Unknown entity kind: {kind}")
+        densities[kind] = float(value)
+    return densities
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Indian legal corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--sizes", nargs="+", default=["10KB"], help="One document per size, e.g. 10KB 1MB")
+    parser.add_argument("--count", type=int, default=1, help="Documents per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", nargs="*", metavar="KIND=PER_1000_CHARS",
+                        help=f"Override densities; kinds: {', '.join(DEFAULT_DENSITIES)}")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    generator = DocumentGenerator(args.seed, parse_densities(args.density))
+    for size in args.sizes:
+        for i in range(args.count):
+            path = os.path.join(args.out_dir, f"synthetic_{size}_{i}.txt")
+            generator.write(path, parse_size(size))
+            print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Local stand-in for the LLaMA /api/generate endpoint, for benchmarks and offline runs.
+
+    python -m benchmarks.llama_stub --port 11434 --latency-ms 200
+
+Answers single-block prompts with one JSON object and batch prompts with a JSON array,
+filling pincode/state from the block text, after an optional fixed latency.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+BLOCK_REGEX = re.compile(r'"""(.*?)"""', re.DOTALL)
+PIN_REGEX = re.compile(r"\b\d{6}\b")
+STATES = ("Karnataka", "Tamil Nadu", "Maharashtra", "Delhi", "West Bengal", "Telangana")
+
+FIELDS = ("flat_or_house_number", "building_or_post_office", "street", "area",
+          "town_or_city", "district", "state", "country", "pincode")
+
+
+def fake_parse(block: str) -> dict:
+    parsed = {key: "-" for key in FIELDS}
+    pin = PIN_REGEX.search(block)
+    if pin:
+        parsed["pincode"] = pin.group(0)
+        parsed["country"] = "India"
+    for state in STATES:
+        if state.lower() in block.lower():
+            parsed["state"] = state
+            break
+    return parsed
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        prompt = json.loads(self.rfile.read(length) or b"{}").get("prompt", "")
+        time.sleep(self.latency)
+
+        blocks = BLOCK_REGEX.findall(prompt)
+        if "JSON array" in prompt:
+            answer = [fake_parse(block) for block in blocks]
+        else:
+            answer = fake_parse(blocks[0] if blocks else prompt)
+        body = json.dumps({"response": json.dumps(answer), "done": True}).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LlamaStub:
+    """Threaded stub server; use as a context manager to run it in the background."""
+
+    def __init__(self, port: int = 0, latency_ms: float = 0.0):
+        handler = type("Handler", (StubHandler,), {"latency": latency_ms / 1000})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake LLaMA generate endpoint.")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    stub = LlamaStub(args.port, args.latency_ms)
+    print(f"LLaMA stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
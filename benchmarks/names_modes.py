@@ -0,0 +1,98 @@
+"""Compare the fast names mode with the hybrid (IndicNER + Flair) one: speed and recall.
+
+    python -m benchmarks.names_modes files --documents 4 --size 100KB
+
+Hybrid output is the reference: recall is the share of its people and organizations the
+fast mode also finds, and "extra" counts what only the fast mode reports. Synthetic
+documents use the generator's own name lists, so their fast-mode recall is optimistic.
+The folder documents give the realistic figure, as long as the gazetteer in
+extractors/fast_names.py is not tuned to them. Use --fast-only where the models are not
+installed.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from benchmarks.corpus import DocumentGenerator, parse_size
+
+
+def load_texts(folder: str, documents: int, size: str, seed: int) -> List[str]:
+    texts = []
+    if folder:
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".txt"):
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    texts.append(f.read())
+    generator = DocumentGenerator(seed)
+    texts.extend(generator.document(parse_size(size)) for _ in range(documents))
+    return texts
+
+
+def run(texts: List[str], names_mode: str, batch_size: int) -> dict:
+    from extractors.names import resolve_names_batch
+
+    start = time.perf_counter()
+    results = []
+    for i in range(0, len(texts), batch_size):
+        results.extend(resolve_names_batch(texts[i:i + batch_size], names_mode=names_mode))
+    wall = time.perf_counter() - start
+    return {
+        "wall": wall,
+        "people": [set(people) for people, _, _ in results],
+        "orgs": [set(orgs) for _, orgs, _ in results],
+    }
+
+
+def compare(reference: List[set], candidate: List[set]) -> tuple:
+    """(reference total, found by both, only in candidate)."""
+    total = sum(len(ours) for ours in reference)
+    common = sum(len(ours & theirs) for ours, theirs in zip(reference, candidate))
+    extra = sum(len(theirs - ours) for ours, theirs in zip(reference, candidate))
+    return total, common, extra
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fast vs hybrid names mode: throughput and recall.")
+    parser.add_argument("folder", nargs="?", default=None, help="Folder of .txt files to include")
+    parser.add_argument("--documents", type=int, default=4, help="Synthetic documents to add")
+    parser.add_argument("--size", default="100KB", help="Size of each synthetic document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=4, help="Documents per resolve_names_batch call")
+    parser.add_argument("--fast-only", action="store_true", help="Only time the fast mode")
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.folder, args.documents, args.size, args.seed)
+    if not texts:
+        print("No documents to run", file=sys.stderr)
+        return 1
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 2**20
+
+    fast = run(texts, "fast", args.batch_size)
+    runs = [("fast", fast)]
+    if not args.fast_only:
+        from extractors.models import models
+
+        models.load_all()  # keep model loading out of the hybrid timing
+        runs.append(("hybrid", run(texts, "hybrid", args.batch_size)))
+
+    print(f"{len(texts)} documents, {megabytes:.2f} MB")
+    print(f"{'mode':<8} {'wall s':>8} {'MB/s':>8} {'people':>7} {'orgs':>6}")
+    for label, result in runs:
+        throughput = megabytes / result["wall"] if result["wall"] else float("inf")
+        print(f"{label:<8} {result['wall']:>8.2f} {throughput:>8.2f} "
+              f"{sum(map(len, result['people'])):>7} {sum(map(len, result['orgs'])):>6}")
+
+    if not args.fast_only:
+        hybrid = runs[1][1]
+        print(f"speedup {hybrid['wall'] / fast['wall'] if fast['wall'] else float('inf'):.0f}x")
+        for kind in ("people", "orgs"):
+            total, common, extra = compare(hybrid[kind], fast[kind])
+            recall = common / total if total else 1.0
+            print(f"{kind:<7} recall vs hybrid {recall:.1%} ({common}/{total}), {extra} only in fast mode")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
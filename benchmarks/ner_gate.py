@@ -0,0 +1,101 @@
+"""Measure what the pre-NER gate saves: sentences skipped, memo hits and model time.
+
+    python -m benchmarks.ner_gate files --size 200KB --documents 8 --mode windows
+
+Every document is resolved with the prefilter off, then on (chunk memo cleared first),
+then on again with the memo kept warm, and the people and organizations found are
+compared. Exits non-zero when the gated run loses more than --max-lost of the names
+found without it, or when the warm run finds anything different from the cold one.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from benchmarks.corpus import DocumentGenerator, parse_size
+
+MODEL_STAGES = ("ner.indic.tokenize", "ner.indic.forward", "ner.flair.predict")
+
+
+def load_texts(folder: str, documents: int, size: str, seed: int) -> List[str]:
+    texts = []
+    if folder:
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".txt"):
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    texts.append(f.read())
+    generator = DocumentGenerator(seed)
+    texts.extend(generator.document(parse_size(size)) for _ in range(documents))
+    return texts
+
+
+def run(texts: List[str], prefilter: bool, mode: str, batch_size: int, warm: bool = False) -> dict:
+    from extractors.metrics import metrics
+    from extractors.names import chunk_memo, prefilter_stats, resolve_names_batch
+
+    if not warm:
+        chunk_memo.clear()
+    metrics.drain()
+    before = prefilter_stats.snapshot()
+    start = time.perf_counter()
+    results = []
+    for i in range(0, len(texts), batch_size):
+        results.extend(resolve_names_batch(texts[i:i + batch_size], mode=mode, prefilter=prefilter))
+    wall = time.perf_counter() - start
+    after = prefilter_stats.snapshot()
+    stages = metrics.drain()["stages"]
+    return {
+        "wall": wall,
+        "model_s": sum(stages[name]["wall"] for name in MODEL_STAGES if name in stages),
+        "gate_s": stages["ner.prefilter"]["wall"] if "ner.prefilter" in stages else 0.0,
+        "chunks": after["chunks"] - before["chunks"],
+        "skipped": after["skipped"] - before["skipped"],
+        "memo_hits": after["memo_hits"] - before["memo_hits"],
+        "names": [set(people) | set(orgs) for people, orgs, _ in results],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare hybrid NER with and without the pre-NER gate.")
+    parser.add_argument("folder", nargs="?", default=None, help="Folder of .txt files to include")
+    parser.add_argument("--documents", type=int, default=4, help="Synthetic documents to add")
+    parser.add_argument("--size", default="50KB", help="Size of each synthetic document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", default=None, help="IndicNER mode: windows or chunks")
+    parser.add_argument("--batch-size", type=int, default=4, help="Documents per resolve_names_batch call")
+    parser.add_argument("--max-lost", type=float, default=0.01,
+                        help="Allowed fraction of names found only with the prefilter off")
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.folder, args.documents, args.size, args.seed)
+    if not texts:
+        print("No documents to run", file=sys.stderr)
+        return 1
+    baseline = run(texts, False, args.mode, args.batch_size)
+    gated = run(texts, True, args.mode, args.batch_size)
+    warm = run(texts, True, args.mode, args.batch_size, warm=True)
+
+    found = sum(len(names) for names in baseline["names"])
+    lost = sum(len(ours - theirs) for ours, theirs in zip(baseline["names"], gated["names"]))
+    gained = sum(len(theirs - ours) for ours, theirs in zip(baseline["names"], gated["names"]))
+    differ = sum(1 for cold, rerun in zip(gated["names"], warm["names"]) if cold != rerun)
+    chunks = gated["chunks"] or 1
+    to_ner = gated["chunks"] - gated["skipped"] - gated["memo_hits"]
+
+    print(f"{len(texts)} documents, {gated['chunks']} sentences: {gated['skipped']} skipped "
+          f"({gated['skipped'] / chunks:.1%}), {gated['memo_hits']} from memo "
+          f"({gated['memo_hits'] / chunks:.1%}), {to_ner} to NER")
+    print(f"{'prefilter':<10} {'wall s':>8} {'model s':>8} {'gate ms':>8}")
+    for label, result in (("off", baseline), ("on", gated), ("on, warm", warm)):
+        print(f"{label:<10} {result['wall']:>8.2f} {result['model_s']:>8.2f} {result['gate_s'] * 1000:>8.1f}")
+    speedup = baseline["wall"] / gated["wall"] if gated["wall"] else float("inf")
+    print(f"speedup {speedup:.2f}x | names {found}, lost {lost}, gained {gained}")
+    if differ:
+        print(f"Warm memo changed the names of {differ}/{len(texts)} documents", file=sys.stderr)
+        return 1
+    return 1 if found and lost / found > args.max_lost else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Check that the ONNX IndicNER backends label like the PyTorch one, and compare their speed and memory.
+
+    python -m benchmarks.ner_parity --size 200KB --backends torch onnx onnx-int8
+
+Each backend runs in its own process on the same synthetic chunks, so the peak RSS figures
+are not polluted by the other models. Exits non-zero when a backend's token labels differ
+from the torch labels on more than --max-mismatch of the tokens.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from typing import List
+
+from benchmarks.corpus import DocumentGenerator, parse_size
+
+
+def run_backend(backend: str, chunks: List[str], batch_size: int, max_batch_tokens: int, threads: int) -> dict:
+    """Label every chunk with one backend; runs inside a fresh process."""
+    from extractors.metrics import peak_rss_kb
+    from extractors.models import models
+    from extractors.names import INDIC_MAX_LENGTH, pack_batches
+
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    models.configure(indic_backend=backend, threads=threads)
+
+    rss_before = peak_rss_kb()
+    start = time.perf_counter()
+    tokenizer, runner, _ = models.indic()
+    load_s = time.perf_counter() - start
+
+    encoded = tokenizer(chunks, truncation=True, max_length=INDIC_MAX_LENGTH)
+    all_ids = encoded["input_ids"]
+    labels: List[List[int]] = [[] for _ in chunks]
+    forward_s = 0.0
+    for batch in pack_batches([len(ids) for ids in all_ids], batch_size, max_batch_tokens):
+        padded = tokenizer.pad({"input_ids": [all_ids[i] for i in batch],
+                                "attention_mask": [encoded["attention_mask"][i] for i in batch]},
+                               return_tensors="np")
+        start = time.perf_counter()
+        predictions = runner.predict(padded["input_ids"], padded["attention_mask"]).tolist()
+        forward_s += time.perf_counter() - start
+        for row, i in enumerate(batch):
+            labels[i] = predictions[row][:len(all_ids[i])]
+
+    return {
+        "backend": backend,
+        "load_s": load_s,
+        "forward_s": forward_s,
+        "tokens": sum(len(ids) for ids in all_ids),
+        "peak_rss_mb": peak_rss_kb() / 1024,
+        "model_rss_mb": (peak_rss_kb() - rss_before) / 1024,
+        "labels": labels,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="IndicNER backend parity and latency check.")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--size", default="200KB", help="Synthetic text to label")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-batch-tokens", type=int, default=8192)
+    parser.add_argument("--threads", type=int, default=0, help="Inference threads (0 = library default)")
+    parser.add_argument("--max-mismatch", type=float, default=0.005,
+                        help="Allowed fraction of tokens labelled differently from torch")
+    args = parser.parse_args(argv)
+
+    from extractors.names import chunk_text
+
+    chunks = chunk_text(DocumentGenerator(args.seed).document(parse_size(args.size)))
+    backends = list(dict.fromkeys(["torch"] + args.backends))
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for backend in backends:
+        with context.Pool(1) as pool:
+            runs.append(pool.apply(run_backend, (backend, chunks, args.batch_size,
+                                                 args.max_batch_tokens, args.threads)))
+
+    reference = runs[0]
+    failed = False
+    print(f"{len(chunks)} chunks, {reference['tokens']} tokens")
+    print(f"{'backend':<10} {'load s':>8} {'us/token':>9} {'speedup':>8} {'model MB':>9} "
+          f"{'peak MB':>8} {'mismatch':>9} {'chunks differ':>14}")
+    for run in runs:
+        total = mismatched = chunks_differ = 0
+        for ours, theirs in zip(run["labels"], reference["labels"]):
+            diff = sum(a != b for a, b in zip(ours, theirs))
+            total += len(theirs)
+            mismatched += diff
+            chunks_differ += bool(diff)
+        rate = mismatched / total if total else 0.0
+        failed |= rate > args.max_mismatch
+        per_token = run["forward_s"] / run["tokens"] * 1e6 if run["tokens"] else 0.0
+        speedup = reference["forward_s"] / run["forward_s"] if run["forward_s"] else float("inf")
+        print(f"{run['backend']:<10} {run['load_s']:>8.1f} {per_token:>9.1f} {speedup:>7.2f}x "
+              f"{run['model_rss_mb']:>9.0f} {run['peak_rss_mb']:>8.0f} {rate:>9.4%} {chunks_differ:>14}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
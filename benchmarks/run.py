@@ -0,0 +1,163 @@
+"""Time every extractor and the end-to-end file pipeline on a seeded synthetic corpus.
+
+    python -m benchmarks.run --sizes 10KB 1MB 10MB --repeat 3
+    python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+
+The LLaMA endpoint is replaced by a local stub and the address cache lives in a
+temporary directory, so runs are offline and repeatable. Results are written as JSON
+tagged with the current git commit.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks.corpus import DocumentGenerator, parse_densities, parse_size
+from benchmarks.llama_stub import LlamaStub
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+NER_MODULES = ("torch", "transformers", "flair")
+
+
+def git_commit() -> dict:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {"commit": sha, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def ner_available() -> bool:
+    return all(importlib.util.find_spec(name) is not None for name in NER_MODULES)
+
+
+def time_call(fn: Callable[[], object], repeat: int, before: Callable[[], None]) -> dict:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        before()
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min_s": min(timings),
+        "mean_s": statistics.mean(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "result": result,
+    }
+
+
+def count_entities(found) -> int:
+    if isinstance(found, dict):
+        return sum(len(values) for values in found.values())
+    if found is None:
+        return 0
+    if isinstance(found, tuple):  # ScanResult
+        return sum(len(matches) for matches in found)
+    from extractors.results import ENTITY_FIELDS
+    return sum(len(getattr(found, name)) for name in ENTITY_FIELDS) + len(found.addresses)
+
+
+def run_benchmarks(args) -> dict:
+    # Keep the address cache out of the working tree and empty it before every timing
+    os.environ["ADDRESS_CACHE_PATH"] = os.path.join(args.work_dir, "address_cache.sqlite3")
+
+    from extractors import address
+    from extractors.pipeline import EXTRACTORS
+    from extractors.document import get_document
+    from extractors.scanner import scan_text
+    import main as pipeline_main
+
+    with_ner = ner_available() and not args.no_ner
+    skipped = [] if with_ner else ["names"]
+    extractors = [e for e in EXTRACTORS if e.name not in skipped]
+    only = [e.name for e in extractors]
+
+    def reset_caches():
+        scan_text.cache_clear()
+        get_document.cache_clear()
+        address.get_address_cache().clear()
+
+    generator = DocumentGenerator(args.seed, parse_densities(args.density))
+    rows: List[dict] = []
+
+    with LlamaStub(latency_ms=args.latency_ms) as stub:
+        address.LLAMA_API_URL = stub.url
+        for size in args.sizes:
+            chars = parse_size(size)
+            path = os.path.join(args.work_dir, f"synthetic_{size}.txt")
+            generator.write(path, chars)
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            nbytes = len(text.encode("utf-8"))
+
+            stages = [(f"extract.{e.name}", (lambda e=e: e.run(text))) for e in extractors]
+            stages.append(("scan.patterns", lambda: scan_text(text)))
+            stages.append(("process_file", lambda: pipeline_main.extract_file(path, only=only)))
+
+            for stage, fn in stages:
+                timing = time_call(fn, args.repeat, reset_caches)
+                rows.append({
+                    "size": size,
+                    "bytes": nbytes,
+                    "stage": stage,
+                    "repeat": args.repeat,
+                    "min_s": timing["min_s"],
+                    "mean_s": timing["mean_s"],
+                    "stdev_s": timing["stdev_s"],
+                    "mb_per_s": nbytes / timing["min_s"] / 2**20 if timing["min_s"] else None,
+                    "entities": count_entities(timing["result"]),
+                })
+                print(f"{size:>8} {stage:<22} {timing['min_s'] * 1000:>10.1f} ms  "
+                      f"{rows[-1]['mb_per_s'] or 0:>8.2f} MB/s  {rows[-1]['entities']:>7} entities",
+                      flush=True)
+
+    return {
+        **git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "densities": parse_densities(args.density),
+        "llm_latency_ms": args.latency_ms,
+        "skipped": skipped,
+        "results": rows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the extractors on a synthetic corpus.")
+    parser.add_argument("--sizes", nargs="+", default=["10KB", "1MB"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", nargs="*", metavar="KIND=PER_1000_CHARS")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated LLM latency per request")
+    parser.add_argument("--no-ner", action="store_true", help="Skip the IndicNER/Flair names extractor")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<time>_<commit>.json)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="extraction-bench-") as work_dir:
+        args.work_dir = work_dir
+        report = run_benchmarks(args)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        tag = (report["commit"] or "nogit")[:10] + ("-dirty" if report["dirty"] else "")
+        output = os.path.join(RESULTS_DIR, f"{report['timestamp'].replace(':', '')}_{tag}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
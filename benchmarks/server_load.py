@@ -0,0 +1,64 @@
+"""Send synthetic documents to a running extraction service and report throughput and latency.
+
+    python -m extractors.server --port 8765 &
+    python -m benchmarks.server_load --url http://127.0.0.1:8765 --documents 200 --concurrency 16
+
+Requests answered 503 are retried after the server's Retry-After delay.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import DocumentGenerator, parse_size
+
+
+def post(url: str, payload: dict) -> tuple:
+    """Return (latency seconds, retries) for one request, retrying while the server is busy."""
+    body = json.dumps(payload).encode("utf-8")
+    start = time.perf_counter()
+    retries = 0
+    while True:
+        request = urllib.request.Request(f"{url}/extract", body, {"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+            return time.perf_counter() - start, retries
+        except urllib.error.HTTPError as e:
+            if e.code != 503:
+                raise
+            retries += 1
+            time.sleep(float(e.headers.get("Retry-After", 1)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the extraction service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size", default="4KB", help="Size of each synthetic document")
+    parser.add_argument("--only", nargs="*", default=None, help="Extractors to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = DocumentGenerator(args.seed)
+    payloads = [{"text": generator.document(parse_size(args.size)), "file": f"doc_{i}", "only": args.only}
+                for i in range(args.documents)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(lambda payload: post(args.url, payload), payloads))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    print(f"{args.documents} documents, concurrency {args.concurrency}: {wall:.2f}s, "
+          f"{args.documents / wall:.1f} docs/s, {sum(r for _, r in results)} busy retries")
+    print(f"latency ms: p50 {statistics.median(latencies) * 1000:.0f}  "
+          f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.0f}  max {latencies[-1] * 1000:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 import re
+from typing import List
+from extractors.document import Span
+from extractors.scanner import scan_text
+
+EXTRACTOR_VERSION = "1"
 
 SECTION_PATTERN = re.compile(
     r"""
@@ -23,18 +28,21 @@ def title_case_act_name(name):
     tokens = re.split(r'(\W+)', name)
     return ''.join(smart_title(token) for token in tokens)
 
+def format_act(section_num: str, act_name_part: str, act_type: str, year: str) -> str:
+    section_cleaned = f"Section {section_num}".replace("  ", " ").replace(" (", "(").strip()
+    act_name_part = act_name_part.strip()
+    act_type = act_type.strip() if act_type else ""
+    full_act_name = f"{act_name_part} {act_type}".strip()
+    full_act_name_titled = title_case_act_name(full_act_name)
+
+    parts = [section_cleaned, "of", full_act_name_titled]
+    if year:
+        parts.append(year)
+    return " ".join(parts)
+
+def extract_acts_sections_spans(text: str) -> List[Span]:
+    return [Span(start, end, "ACT", "scanner", format_act(*groups[1:]))
+            for start, end, groups in scan_text(text).acts]
+
 def extract_acts_sections(text: str):
-    matches = SECTION_PATTERN.findall(text)
-    results = set()
-    for section_word, section_num, act_name_part, act_type, year in matches:
-        section_cleaned = f"Section {section_num}".replace("  ", " ").replace(" (", "(").strip()
-        act_name_part = act_name_part.strip()
-        act_type = act_type.strip() if act_type else ""
-        full_act_name = f"{act_name_part} {act_type}".strip()
-        full_act_name_titled = title_case_act_name(full_act_name)
-
-        parts = [section_cleaned, "of", full_act_name_titled]
-        if year:
-            parts.append(year)
-        results.add(" ".join(parts))
-    return sorted(results)
+    return sorted({span.value for span in extract_acts_sections_spans(text)})
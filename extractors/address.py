@@ -1,11 +1,29 @@
-import requests
 import json
+import os
 import re
 import ast
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from extractors.address_cache import AddressCache, cache_key
+from extractors.address_scoring import ADDRESS_MIN_SCORE, parse_address_offline, score_address
+from extractors.document import Span
+from extractors.llm_client import LlamaClient
+from extractors.logger import get_logger
+
+logger = get_logger("AddressParser")
+
+EXTRACTOR_VERSION = "2"
 
 LLAMA_API_URL = "http://localhost:11434/api/generate"
 LLAMA_MODEL = "llama3"
 
+# Bump whenever a prompt changes so cached parses from the old prompt are not reused
+ADDRESS_PROMPT_VERSION = "1"
+
+# Blocks packed into one prompt (K); 1 sends every block on its own
+ADDRESS_BATCH_SIZE = int(os.environ.get("ADDRESS_BATCH_SIZE", 4))
+
 # Desired Indian address structure
 ADDRESS_FIELDS = [
     "flat_or_house_number",
@@ -19,9 +37,41 @@ ADDRESS_FIELDS = [
     "pincode"
 ]
 
-def call_llama_address_parser(text: str) -> dict:
-    """Call local LLaMA model to parse address into structured Indian format."""
-    prompt = f"""
+_client: Optional[LlamaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llama_client() -> LlamaClient:
+    """Shared pooled client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LlamaClient(LLAMA_API_URL, LLAMA_MODEL)
+    return _client
+
+
+_cache: Optional[AddressCache] = None
+_cache_pid: Optional[int] = None
+
+
+def get_address_cache() -> AddressCache:
+    """Shared on-disk parse cache, reopened after a fork so processes never share a connection."""
+    global _cache, _cache_pid
+    if _cache is None or _cache_pid != os.getpid():
+        with _client_lock:
+            if _cache is None or _cache_pid != os.getpid():
+                _cache = AddressCache()
+                _cache_pid = os.getpid()
+    return _cache
+
+
+def empty_address() -> dict:
+    return {key: "-" for key in ADDRESS_FIELDS}
+
+
+def build_address_prompt(text: str) -> str:
+    return f"""
 You are an expert in Indian address extraction.
 
 From the following unstructured text, extract an Indian address and return it as a JSON object with these fields:
@@ -41,70 +91,233 @@ Text:
 \"\"\"{text}\"\"\"
 """
 
-    response = requests.post(LLAMA_API_URL, json={
-        "model": LLAMA_MODEL,
-        "prompt": prompt,
-        "stream": False
-    })
 
-    if response.status_code != 200:
-        print(f"❌ Error: {response.status_code}")
-        return {key: "-" for key in ADDRESS_FIELDS}
+def build_batch_address_prompt(blocks: List[str]) -> str:
+    numbered = "\n\n".join(f'Text {i}:\n\"\"\"{block}\"\"\"' for i, block in enumerate(blocks, 1))
+    return f"""
+You are an expert in Indian address extraction.
 
-    raw_response = response.json().get("response", "").strip()
+Below are {len(blocks)} numbered unstructured texts. From each text, extract an Indian address as a JSON object with these fields:
+- flat_or_house_number
+- building_or_post_office
+- street
+- area
+- town_or_city
+- district
+- state
+- country
+- pincode
+
+If a field is not found, return it as "-". Respond ONLY with a valid compact JSON array of exactly {len(blocks)} objects, one per text, in the same order. No explanations.
+
+{numbered}
+"""
 
+
+def load_model_response(raw_response: str):
+    """Decode a model response as JSON, falling back to a Python literal; None if neither works."""
     # Attempt strict JSON parsing
     try:
-        parsed = json.loads(raw_response)
-        if isinstance(parsed, dict):
-            return {k: parsed.get(k, "-") for k in ADDRESS_FIELDS}
+        return json.loads(raw_response)
     except Exception:
         pass
 
-    # Fallback: try Python dict literal (less strict)
+    # Fallback: try Python literal (less strict)
     try:
-        parsed = ast.literal_eval(raw_response)
-        if isinstance(parsed, dict):
-            return {k: parsed.get(k, "-") for k in ADDRESS_FIELDS}
+        return ast.literal_eval(raw_response)
     except Exception:
-        pass
+        return None
 
-    print("⚠️ Could not parse model response:")
-    print(raw_response)
-    return {key: "-" for key in ADDRESS_FIELDS}
+
+def to_address_fields(parsed) -> Optional[dict]:
+    if isinstance(parsed, dict):
+        return {k: parsed.get(k, "-") for k in ADDRESS_FIELDS}
+    return None
+
+
+def call_llama_address_parser(text: str, client: Optional[LlamaClient] = None) -> dict:
+    """Call local LLaMA model to parse address into structured Indian format."""
+    return _parse_block(text, client) or empty_address()
+
+
+def _parse_block(text: str, client: Optional[LlamaClient] = None) -> Optional[dict]:
+    """Parse one block; None when the request fails or the response is unusable."""
+    client = client or get_llama_client()
+    raw_response = client.generate(build_address_prompt(text))
+    if raw_response is None:
+        return None
+
+    address = to_address_fields(load_model_response(raw_response))
+    if address is None:
+        logger.warning(f"⚠️ Could not parse model response: {raw_response}")
+    return address
+
+
+def _parse_block_batch(blocks: List[str], client: Optional[LlamaClient] = None) -> List[Optional[dict]]:
+    """Parse K blocks with one prompt.
+
+    Blocks whose entry in the response is missing or malformed, or every block when the
+    response is not an array of the right length, are re-sent as single-block calls. When
+    no response arrives at all the client has already spent its retries, so nothing is
+    re-sent and every block gets None.
+    """
+    client = client or get_llama_client()
+    if len(blocks) == 1:
+        return [_parse_block(blocks[0], client)]
+
+    raw_response = client.generate(build_batch_address_prompt(blocks))
+    if raw_response is None:
+        return [None] * len(blocks)
+    parsed = load_model_response(raw_response)
+    if isinstance(parsed, list) and len(parsed) == len(blocks):
+        results = [to_address_fields(item) for item in parsed]
+    else:
+        results = [None] * len(blocks)
+
+    failed = [i for i, address in enumerate(results) if address is None]
+    if failed:
+        logger.warning(f"⚠️ Batch response unusable for {len(failed)}/{len(blocks)} blocks, retrying them one by one")
+        for i in failed:
+            results[i] = _parse_block(blocks[i], client)
+    return results
+
+
+# A line containing either of these closes the block being collected
+PIN_LIKE_REGEX = re.compile(r"\b\d{6}\b")
+ADDRESS_WORD_REGEX = re.compile(r"\b(distt|district|state|pin|po|ps|city|village)\b", re.IGNORECASE)
+
+# Lines collected before an untriggered block is given up
+MAX_BLOCK_LINES = 4
+
+
+class AddressBlockDetector:
+    """Line-at-a-time address block detection, so blocks can be found while streaming a file.
+
+    A block closes on the first line with a PIN-like number or an address word. Closed
+    blocks are then scored (see address_scoring) and only those reaching ``min_score``
+    are returned; the rest are dropped as false positives.
+    """
+
+    def __init__(self, min_score: float = ADDRESS_MIN_SCORE):
+        self.buffer = []
+        self.min_score = min_score
+
+    def feed(self, line: str) -> Optional[str]:
+        """Consume one line; return the completed address block, if this line closes one."""
+        line = line.strip()
+        if not line:
+            return None
+
+        self.buffer.append(line)
+        # Lines are joined with spaces, so a match never spans two of them: only the new line needs checking
+        if PIN_LIKE_REGEX.search(line) or ADDRESS_WORD_REGEX.search(line):
+            block = " ".join(self.buffer)
+            self.buffer.clear()
+            return block if score_address(block) >= self.min_score else None
+        elif len(self.buffer) >= MAX_BLOCK_LINES:
+            self.buffer.clear()
+        return None
+
+
+def get_address_block_spans(text: str) -> List[Span]:
+    """Address-like blocks with the character range they cover; ``value`` is the joined block."""
+    detector = AddressBlockDetector()
+    spans = []
+    block_start = 0
+    line_start = 0
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped:
+            if not detector.buffer:
+                block_start = line_start + line.index(stripped[0])
+            block = detector.feed(line)
+            if block is not None:
+                spans.append(Span(block_start, line_start + len(line.rstrip()), "ADDRESS", "address-detector", block))
+        line_start += len(line)
+
+    return spans
 
 
 def get_address_blocks(text: str) -> list:
     """Heuristically identify address-like chunks from raw text."""
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    blocks = []
-    buffer = []
+    return [span.value for span in get_address_block_spans(text)]
+
+
+def parse_address_blocks(blocks: List[str], client: Optional[LlamaClient] = None,
+                         use_cache: bool = True, batch_size: int = ADDRESS_BATCH_SIZE,
+                         offline: bool = True) -> List[dict]:
+    """Parse many blocks concurrently; results keep the order of ``blocks``.
+
+    With ``offline`` blocks whose structure is unambiguous (see parse_address_offline)
+    are parsed locally and never reach the model. With ``use_cache`` each remaining
+    distinct block is looked up in the on-disk cache first and only the misses are sent
+    to the model, ``batch_size`` blocks per prompt. Failed parses are never cached.
+    """
+    if not blocks:
+        return []
+    client = client or get_llama_client()
+    cache = get_address_cache() if use_cache else None
 
-    for line in lines:
-        buffer.append(line)
-        joined = " ".join(buffer)
+    results: List[Optional[dict]] = [None] * len(blocks)
+    pending = {}  # cache key -> indices of blocks sharing it
+    for i, block in enumerate(blocks):
+        if offline:
+            fields = parse_address_offline(block)
+            if fields is not None:
+                results[i] = dict(empty_address(), **fields)
+                continue
+        key = cache_key(block, client.model, ADDRESS_PROMPT_VERSION)
+        if key in pending:
+            pending[key].append(i)
+            continue
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending[key] = [i]
 
-        if re.search(r"\b\d{6}\b", joined) or re.search(r"\b(distt|district|state|pin|po|ps|city|village)\b", joined, re.IGNORECASE):
-            blocks.append(joined)
-            buffer.clear()
-        elif len(buffer) > 3:
-            buffer.clear()
+    def parse(group):
+        parsed = _parse_block_batch([blocks[indices[0]] for _, indices in group], client)
+        if cache:
+            for (key, _), address in zip(group, parsed):
+                if address is not None:
+                    cache.put(key, address)
+        return group, parsed
 
-    return blocks
+    items = list(pending.items())
+    batch_size = max(1, batch_size)
+    groups = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(client.max_concurrency, len(groups))) as pool:
+            for group, parsed in pool.map(parse, groups):
+                for (_, indices), address in zip(group, parsed):
+                    for i in indices:
+                        results[i] = address
 
+    return [parsed or empty_address() for parsed in results]
 
-def extract_all_addresses(text: str) -> list:
+
+def extract_all_addresses(text: str, use_cache: bool = True, batch_size: int = ADDRESS_BATCH_SIZE) -> list:
     """Main function to extract structured addresses using LLaMA."""
-    raw_blocks = get_address_blocks(text)
-    results = []
+    return extract_all_addresses_batch([text], use_cache, batch_size)[0]
 
-    for block in raw_blocks:
-        parsed = call_llama_address_parser(block)
-        results.append({
-            "raw_block": block,
-            "components": parsed
-        })
 
+def extract_all_addresses_batch(texts: List[str], use_cache: bool = True,
+                                batch_size: int = ADDRESS_BATCH_SIZE) -> List[list]:
+    """Extract addresses for several documents, sending every block of the batch at once."""
+    doc_blocks = [get_address_blocks(text) for text in texts]
+    parsed = parse_address_blocks([block for blocks in doc_blocks for block in blocks],
+                                  use_cache=use_cache, batch_size=batch_size)
+
+    results = []
+    offset = 0
+    for blocks in doc_blocks:
+        results.append([
+            {"raw_block": block, "components": components}
+            for block, components in zip(blocks, parsed[offset:offset + len(blocks)])
+        ])
+        offset += len(blocks)
     return results
 
 
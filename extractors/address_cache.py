@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+from extractors.logger import get_logger
+
+logger = get_logger("AddressCache")
+
+DEFAULT_CACHE_PATH = os.environ.get("ADDRESS_CACHE_PATH", os.path.join(".cache", "address_cache.sqlite3"))
+DEFAULT_MAX_BYTES = int(os.environ.get("ADDRESS_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Fraction of max_bytes to shrink to once the limit is exceeded, so eviction runs rarely
+EVICT_TARGET = 0.9
+
+
+def normalize_block(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(block: str, model: str, prompt_version: str) -> str:
+    """Content address of a parse: normalized block text + model + prompt version."""
+    payload = f"{model}\x00{prompt_version}\x00{normalize_block(block)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AddressCache:
+    """On-disk SQLite store of parsed address components with size-based LRU eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(key) + len(data.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time())
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        target = int(self.max_bytes * EVICT_TARGET)
+        evicted = 0
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in rows])
+            self._total_bytes -= sum(size for _, size in rows)
+            evicted += len(rows)
+        logger.info(f"Evicted {evicted} cached address parses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,248 @@
+import os
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Blocks scoring below this are treated as false positives and never parsed
+ADDRESS_MIN_SCORE = float(os.environ.get("ADDRESS_MIN_SCORE", 3))
+
+# Blocks longer than this are usually running prose that happens to mention a place
+ADDRESS_MAX_CHARS = 300
+
+# Score weights
+PIN_WEIGHT = 3
+STATE_WEIGHT = 2
+PIN_STATE_AGREE_WEIGHT = 1
+DISTRICT_MARKER_WEIGHT = 2
+POST_MARKER_WEIGHT = 1
+PLACE_WEIGHT = 1
+STRUCTURE_WEIGHT = 1
+STRUCTURE_MAX = 2
+NARRATIVE_WEIGHT = -1
+NARRATIVE_MAX = 4
+TOO_LONG_WEIGHT = -2
+
+STATES = {
+    "Andhra Pradesh": (), "Arunachal Pradesh": (), "Assam": (), "Bihar": (), "Chhattisgarh": (),
+    "Goa": (), "Gujarat": (), "Haryana": (), "Himachal Pradesh": (), "Jharkhand": (),
+    "Karnataka": (), "Kerala": (), "Madhya Pradesh": (), "Maharashtra": (), "Manipur": (),
+    "Meghalaya": (), "Mizoram": (), "Nagaland": (), "Odisha": ("Orissa",), "Punjab": (),
+    "Rajasthan": (), "Sikkim": (), "Tamil Nadu": ("Tamilnadu",), "Telangana": (), "Tripura": (),
+    "Uttar Pradesh": (), "Uttarakhand": ("Uttaranchal",), "West Bengal": (),
+    "Andaman and Nicobar Islands": (), "Chandigarh": (), "Delhi": ("New Delhi",),
+    "Dadra and Nagar Haveli and Daman and Diu": (), "Jammu and Kashmir": ("Jammu & Kashmir",),
+    "Ladakh": (), "Lakshadweep": (), "Puducherry": ("Pondicherry",),
+}
+
+# Abbreviations are too ambiguous on their own ("MP", "UP"); they only count right before a PIN
+STATE_ABBREVIATIONS = {
+    "AP": "Andhra Pradesh", "HP": "Himachal Pradesh", "MP": "Madhya Pradesh", "TN": "Tamil Nadu",
+    "UK": "Uttarakhand", "UP": "Uttar Pradesh", "WB": "West Bengal",
+}
+
+# Postal circles by the first two PIN digits
+PIN_PREFIX_STATES = {
+    "11": ("Delhi",), "12": ("Haryana",), "13": ("Haryana",), "14": ("Punjab",), "15": ("Punjab",),
+    "16": ("Punjab", "Chandigarh", "Haryana"), "17": ("Himachal Pradesh",),
+    "18": ("Jammu and Kashmir",), "19": ("Jammu and Kashmir", "Ladakh"),
+    "20": ("Uttar Pradesh",), "21": ("Uttar Pradesh",), "22": ("Uttar Pradesh",), "23": ("Uttar Pradesh",),
+    "24": ("Uttar Pradesh", "Uttarakhand"), "25": ("Uttar Pradesh",), "26": ("Uttar Pradesh", "Uttarakhand"),
+    "27": ("Uttar Pradesh",), "28": ("Uttar Pradesh",),
+    "30": ("Rajasthan",), "31": ("Rajasthan",), "32": ("Rajasthan",), "33": ("Rajasthan",), "34": ("Rajasthan",),
+    "36": ("Gujarat",), "37": ("Gujarat",), "38": ("Gujarat",),
+    "39": ("Gujarat", "Dadra and Nagar Haveli and Daman and Diu"),
+    "40": ("Maharashtra", "Goa"), "41": ("Maharashtra",), "42": ("Maharashtra",), "43": ("Maharashtra",),
+    "44": ("Maharashtra",),
+    "45": ("Madhya Pradesh",), "46": ("Madhya Pradesh",), "47": ("Madhya Pradesh",), "48": ("Madhya Pradesh",),
+    "49": ("Chhattisgarh",), "50": ("Telangana",),
+    "51": ("Andhra Pradesh",), "52": ("Andhra Pradesh",), "53": ("Andhra Pradesh", "Puducherry"),
+    "56": ("Karnataka",), "57": ("Karnataka",), "58": ("Karnataka",), "59": ("Karnataka",),
+    "60": ("Tamil Nadu", "Puducherry"), "61": ("Tamil Nadu",), "62": ("Tamil Nadu",), "63": ("Tamil Nadu",),
+    "64": ("Tamil Nadu",),
+    "67": ("Kerala", "Puducherry"), "68": ("Kerala", "Lakshadweep"), "69": ("Kerala",),
+    "70": ("West Bengal",), "71": ("West Bengal",), "72": ("West Bengal",),
+    "73": ("West Bengal", "Sikkim"), "74": ("West Bengal", "Andaman and Nicobar Islands"),
+    "75": ("Odisha",), "76": ("Odisha",), "77": ("Odisha",), "78": ("Assam",),
+    "79": ("Arunachal Pradesh", "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Tripura", "Assam"),
+    "80": ("Bihar",), "81": ("Bihar", "Jharkhand"), "82": ("Jharkhand",), "83": ("Jharkhand",),
+    "84": ("Bihar",), "85": ("Bihar",),
+}
+
+# Cities and district headquarters, with the state each lies in
+PLACES = {
+    "Bengaluru": "Karnataka", "Bangalore": "Karnataka", "Mysuru": "Karnataka", "Mysore": "Karnataka",
+    "Mangaluru": "Karnataka", "Mangalore": "Karnataka", "Hubballi": "Karnataka", "Hubli": "Karnataka",
+    "Belagavi": "Karnataka", "Ramanagara": "Karnataka",
+    "Mumbai": "Maharashtra", "Bombay": "Maharashtra", "Navi Mumbai": "Maharashtra", "Thane": "Maharashtra",
+    "Pune": "Maharashtra", "Nagpur": "Maharashtra", "Nashik": "Maharashtra", "Aurangabad": "Maharashtra",
+    "Chennai": "Tamil Nadu", "Madras": "Tamil Nadu", "Coimbatore": "Tamil Nadu", "Madurai": "Tamil Nadu",
+    "Tiruchirappalli": "Tamil Nadu", "Salem": "Tamil Nadu",
+    "Kolkata": "West Bengal", "Calcutta": "West Bengal", "Howrah": "West Bengal", "Siliguri": "West Bengal",
+    "Jalpaiguri": "West Bengal", "Alipurduar": "West Bengal",
+    "Hyderabad": "Telangana", "Secunderabad": "Telangana", "Warangal": "Telangana",
+    "Visakhapatnam": "Andhra Pradesh", "Vijayawada": "Andhra Pradesh", "Guntur": "Andhra Pradesh",
+    "Ahmedabad": "Gujarat", "Surat": "Gujarat", "Vadodara": "Gujarat", "Rajkot": "Gujarat",
+    "Jaipur": "Rajasthan", "Jodhpur": "Rajasthan", "Udaipur": "Rajasthan", "Kota": "Rajasthan",
+    "Lucknow": "Uttar Pradesh", "Kanpur": "Uttar Pradesh", "Agra": "Uttar Pradesh", "Varanasi": "Uttar Pradesh",
+    "Prayagraj": "Uttar Pradesh", "Allahabad": "Uttar Pradesh", "Meerut": "Uttar Pradesh",
+    "Noida": "Uttar Pradesh", "Ghaziabad": "Uttar Pradesh",
+    "Gurugram": "Haryana", "Gurgaon": "Haryana", "Faridabad": "Haryana", "Panipat": "Haryana",
+    "Amritsar": "Punjab", "Ludhiana": "Punjab", "Jalandhar": "Punjab",
+    "Bhopal": "Madhya Pradesh", "Indore": "Madhya Pradesh", "Gwalior": "Madhya Pradesh",
+    "Jabalpur": "Madhya Pradesh",
+    "Patna": "Bihar", "Gaya": "Bihar", "Ranchi": "Jharkhand", "Jamshedpur": "Jharkhand", "Dhanbad": "Jharkhand",
+    "Bhubaneswar": "Odisha", "Cuttack": "Odisha", "Raipur": "Chhattisgarh", "Guwahati": "Assam",
+    "Kochi": "Kerala", "Cochin": "Kerala", "Thiruvananthapuram": "Kerala", "Kozhikode": "Kerala",
+    "Thrissur": "Kerala", "Dehradun": "Uttarakhand", "Shimla": "Himachal Pradesh", "Srinagar": "Jammu and Kashmir",
+    "Jammu": "Jammu and Kashmir", "Panaji": "Goa", "Chandigarh": "Chandigarh",
+}
+
+STRUCTURE_WORDS = (
+    "road", "rd", "street", "marg", "lane", "nagar", "sector", "colony", "layout", "floor", "plot",
+    "block", "wing", "flat", "house", "shed", "near", "opp", "opposite", "village", "area", "complex",
+    "bhawan", "bhavan", "sadan", "building", "tower", "apartment", "phase", "extension", "enclave", "vihar",
+)
+NARRATIVE_WORDS = (
+    "was", "were", "had", "has", "have", "is", "are", "stated", "said", "that", "which", "whereas",
+    "hereby", "he", "she", "they", "would", "who", "under",
+)
+
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+def _build_state_lookup() -> Dict[str, str]:
+    lookup = {}
+    for state, aliases in STATES.items():
+        for name in (state,) + aliases:
+            lookup[name.lower()] = state
+    return lookup
+
+
+STATE_LOOKUP = _build_state_lookup()
+PLACE_LOOKUP = {place.lower(): state for place, state in PLACES.items()}
+
+PIN_REGEX = re.compile(r"\b[1-9]\d{5}\b")
+STATE_REGEX = re.compile(rf"\b(?:{_alternation(STATE_LOOKUP)})\b", re.IGNORECASE)
+STATE_ABBREVIATION_PIN_REGEX = re.compile(rf"\b({_alternation(STATE_ABBREVIATIONS)})[\s,\-]*[1-9]\d{{5}}\b")
+PLACE_REGEX = re.compile(rf"\b(?:{_alternation(PLACE_LOOKUP)})\b", re.IGNORECASE)
+DISTRICT_MARKER_REGEX = re.compile(r"\b(?:distt?|district)\b\.?[\s:\-]*\w", re.IGNORECASE)
+POST_MARKER_REGEX = re.compile(r"\b(?:p\.?\s?o|p\.?\s?s|post|tehsil|taluka?)\b\.?[\s:\-]*\w", re.IGNORECASE)
+STRUCTURE_REGEX = re.compile(rf"\b(?:{_alternation(STRUCTURE_WORDS)})\b", re.IGNORECASE)
+NARRATIVE_REGEX = re.compile(rf"\b(?:{_alternation(NARRATIVE_WORDS)})\b", re.IGNORECASE)
+
+
+class AddressFeatures:
+    """What the cheap pattern and gazetteer lookups found in one block."""
+
+    __slots__ = ("pins", "states", "places", "district_marker", "post_marker", "structure", "narrative", "length")
+
+    def __init__(self, block: str):
+        self.pins: List[str] = PIN_REGEX.findall(block)
+        states = {STATE_LOOKUP[m.group(0).lower()] for m in STATE_REGEX.finditer(block)}
+        states.update(STATE_ABBREVIATIONS[m.group(1)] for m in STATE_ABBREVIATION_PIN_REGEX.finditer(block))
+        self.states: FrozenSet[str] = frozenset(states)
+        self.places: FrozenSet[str] = frozenset(m.group(0).lower() for m in PLACE_REGEX.finditer(block))
+        self.district_marker = DISTRICT_MARKER_REGEX.search(block) is not None
+        self.post_marker = POST_MARKER_REGEX.search(block) is not None
+        self.structure = len({m.group(0).lower() for m in STRUCTURE_REGEX.finditer(block)})
+        self.narrative = len(NARRATIVE_REGEX.findall(block))
+        self.length = len(block)
+
+    def pin_states(self) -> FrozenSet[str]:
+        """States whose postal circle covers one of the PINs."""
+        return frozenset(state for pin in self.pins for state in PIN_PREFIX_STATES.get(pin[:2], ()))
+
+
+def score_address(block: str, features: Optional[AddressFeatures] = None) -> float:
+    """How much a block looks like an Indian postal address; compare with ADDRESS_MIN_SCORE."""
+    features = features or AddressFeatures(block)
+    pin_states = features.pin_states()
+    score = 0.0
+    if pin_states:
+        score += PIN_WEIGHT
+    if features.states:
+        score += STATE_WEIGHT
+        if features.states & pin_states:
+            score += PIN_STATE_AGREE_WEIGHT
+    if features.district_marker:
+        score += DISTRICT_MARKER_WEIGHT
+    if features.post_marker:
+        score += POST_MARKER_WEIGHT
+    if features.places:
+        score += PLACE_WEIGHT
+    score += STRUCTURE_WEIGHT * min(features.structure, STRUCTURE_MAX)
+    score += NARRATIVE_WEIGHT * min(features.narrative, NARRATIVE_MAX)
+    if features.length > ADDRESS_MAX_CHARS:
+        score += TOO_LONG_WEIGHT
+    return score
+
+
+def is_likely_address(block: str, min_score: float = ADDRESS_MIN_SCORE) -> bool:
+    return score_address(block) >= min_score
+
+
+# Patterns for the parts of a comma-separated address, tried in this order
+PART_PATTERNS: List[Tuple[str, "re.Pattern"]] = [
+    ("district", re.compile(r"^(?:distt?|district)\b\.?[\s:\-]*(.+)$", re.IGNORECASE)),
+    ("building_or_post_office", re.compile(r"^(?:p\.?\s?o|post office)\b\.?[\s:\-]*(.+)$", re.IGNORECASE)),
+    ("flat_or_house_number", re.compile(
+        r"^((?:no|door no|h\.?\s?no|house no|flat(?: no)?|plot(?: no)?|shed no)\b\.?[\s:\-]*[\w/\-]+|\d+[a-z]?(?:[/\-]\w+)*)$",
+        re.IGNORECASE)),
+    ("building_or_post_office", re.compile(
+        r"^(.*\b(?:floor|bhawan|bhavan|sadan|building|tower|apartments?|complex|chambers)\b.*)$", re.IGNORECASE)),
+    ("street", re.compile(r"^(.*\b(?:road|rd|street|marg|lane|path)\b\.?)$", re.IGNORECASE)),
+    ("area", re.compile(
+        r"^(.*\b(?:nagar|sector|colony|layout|area|phase|extension|enclave|vihar|puram|village)\b.*)$",
+        re.IGNORECASE)),
+]
+PART_SPLIT_REGEX = re.compile(r"[,\n]")
+STATE_PIN_PART_REGEX = re.compile(r"^(?P<state>[A-Za-z&][A-Za-z& ]*?)?[\s\-,]*(?P<pin>[1-9]\d{5})$")
+
+
+def parse_address_offline(block: str, features: Optional[AddressFeatures] = None) -> Optional[dict]:
+    """Parse a block without the model when its structure leaves no doubt; None otherwise.
+
+    The block must hold exactly one PIN, name exactly one state that the PIN's postal
+    circle agrees with, contain no prose, and split on commas into parts that each match
+    exactly one field pattern, a known city, the state or the PIN, with no field twice.
+    Returns the fields that were found; the caller fills in the missing ones.
+    """
+    features = features or AddressFeatures(block)
+    if len(features.pins) != 1 or len(features.states) != 1 or features.narrative:
+        return None
+    state = next(iter(features.states))
+    if state not in features.pin_states():
+        return None
+
+    fields = {"pincode": features.pins[0], "state": state, "country": "India"}
+    for part in PART_SPLIT_REGEX.split(block):
+        part = part.strip(" .-*")
+        if not part:
+            continue
+        field, value = _classify_part(part, state)
+        if field is None or (field in fields and fields[field] != value):
+            return None
+        fields[field] = value
+    return fields
+
+
+def _classify_part(part: str, state: str) -> Tuple[Optional[str], Optional[str]]:
+    lowered = part.lower()
+    if lowered == "india":
+        return "country", "India"
+    if STATE_LOOKUP.get(lowered) == state:
+        return "state", state
+    match = STATE_PIN_PART_REGEX.match(part)
+    if match:
+        named = match.group("state")
+        if named and STATE_LOOKUP.get(named.strip().lower()) != state and STATE_ABBREVIATIONS.get(named.strip()) != state:
+            return None, None
+        return "pincode", match.group("pin")
+    if PLACE_LOOKUP.get(lowered) == state:
+        return "town_or_city", part
+    for field, pattern in PART_PATTERNS:
+        match = pattern.match(part)
+        if match:
+            return field, match.group(1).strip()
+    return None, None
@@ -1,32 +1,38 @@
 import re
 from typing import Tuple, List
+from extractors.document import Span
 from extractors.logger import get_logger
-from extractors.phone_numbers import extract_phone_numbers
+from extractors.scanner import scan_text
+from extractors.validators import validate_accounts, validate_ifscs
 
 logger = get_logger("BankDetailsExtractor")
 
+EXTRACTOR_VERSION = "2"
+
 # Standard IFSC code: 4 letters, 0, 6 alphanumeric
 IFSC_REGEX = re.compile(r'\b[A-Z]{4}0[A-Z0-9]{6}\b')
 
 # Account numbers: 9–18 digits
 ACCOUNT_REGEX = re.compile(r'\b\d{9,18}\b')
 
-def extract_bank_details(text: str) -> Tuple[List[str], List[str]]:
-    logger.info("Extracting IFSC and Account Numbers...")
+def extract_bank_spans(text: str) -> List[Span]:
+    scan = scan_text(text)
 
-    # Extract raw values
-    ifsc_codes = set(re.findall(IFSC_REGEX, text))
-    all_accounts = set(re.findall(ACCOUNT_REGEX, text))
+    # Phone numbers (mobile only) come from the same scan
+    mobile_numbers = {mobile for _, _, mobile in scan.mobiles}
 
-    # Extract phone numbers (mobile only)
-    mobiles, _ = extract_phone_numbers(text)
-    mobile_numbers = set(mobiles)
+    # Filter out mobile-like numbers from account numbers, then keep those an account keyword vouches for
+    accounts = validate_accounts(text, [m for m in scan.accounts if m[2] not in mobile_numbers and len(m[2]) >= 11])
+    spans = [Span(start, end, "ACCOUNT", "scanner", acc) for start, end, acc in accounts]
+    spans.extend(Span(start, end, "IFSC", "scanner", ifsc) for start, end, ifsc in validate_ifscs(text, scan.ifscs))
+    return spans
+
+def extract_bank_details(text: str) -> Tuple[List[str], List[str]]:
+    logger.debug("Extracting IFSC and Account Numbers...")
 
-    # Filter out mobile-like numbers from account numbers
-    cleaned_accounts = {
-        acc for acc in all_accounts
-        if acc not in mobile_numbers and len(acc) >= 11
-    }
+    spans = extract_bank_spans(text)
+    cleaned_accounts = {span.value for span in spans if span.label == "ACCOUNT"}
+    ifsc_codes = {span.value for span in spans if span.label == "IFSC"}
 
-    logger.info(f"✅ Accounts: {len(cleaned_accounts)} | IFSCs: {len(ifsc_codes)}")
+    logger.debug(f"✅ Accounts: {len(cleaned_accounts)} | IFSCs: {len(ifsc_codes)}")
     return sorted(cleaned_accounts), sorted(ifsc_codes)
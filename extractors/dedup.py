@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class AhoCorasick:
+    """Aho–Corasick automaton over a set of strings, for finding which of them occur inside a text."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.depth: List[int] = [0]
+        self.pattern: List[Optional[str]] = [None]  # pattern ending at each node, if any
+        self.output: List[int] = [0]  # nearest proper suffix node that ends a pattern (0 = none)
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            child = self.goto[node].get(ch)
+            if child is None:
+                child = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.depth.append(self.depth[node] + 1)
+                self.pattern.append(None)
+                self.output.append(0)
+                self.goto[node][ch] = child
+            node = child
+        self.pattern[node] = pattern
+
+    def _link(self):
+        """Breadth-first pass setting failure and output links."""
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                fail = self.fail[child]
+                self.output[child] = fail if self.pattern[fail] is not None else self.output[fail]
+
+    def step(self, node: int, ch: str) -> int:
+        while node and ch not in self.goto[node]:
+            node = self.fail[node]
+        return self.goto[node].get(ch, 0)
+
+    def iter_matches(self, text: str) -> Iterator[str]:
+        """Yield every pattern occurrence in the text, overlapping ones included."""
+        node = 0
+        for ch in text:
+            node = self.step(node, ch)
+            match = node if self.pattern[node] is not None else self.output[node]
+            while match:
+                yield self.pattern[match]
+                match = self.output[match]
+
+
+def deduplicate_by_substring(entities: Iterable[str]) -> List[str]:
+    """Drop entities contained in a longer one; survivors come back longest first.
+
+    Every entity is streamed once through an automaton built over all of them, and each
+    pattern seen ending inside a different entity is dropped. Output chains already walked
+    are remembered, so the total work stays close to linear in the combined length.
+    """
+    entities = sorted(set(entities), key=len, reverse=True)  # longest first
+    if len(entities) < 2:
+        return entities
+    if not entities[-1]:
+        entities.pop()  # the empty string is inside everything else
+
+    automaton = AhoCorasick(entities)
+    pattern, output = automaton.pattern, automaton.output
+    dropped = set()
+    walked = set()
+
+    for entity in entities:
+        node = 0
+        last = len(entity) - 1
+        for i, ch in enumerate(entity):
+            node = automaton.step(node, ch)
+            # At the final character the node is the entity itself, which does not count
+            match = output[node] if i == last or pattern[node] is None else node
+            while match and match not in walked:
+                walked.add(match)
+                dropped.add(pattern[match])
+                match = output[match]
+
+    return [entity for entity in entities if entity not in dropped]
@@ -0,0 +1,58 @@
+import re
+from functools import cached_property, lru_cache
+from typing import List, NamedTuple, Tuple
+
+# Sentence-like pieces: runs between newlines, semicolons and full stops
+SEGMENT_REGEX = re.compile(r"[^\n;.]+")
+
+# Words for the NER taggers: letter/digit runs (Indic vowel signs and joiners included) or single symbols
+WORD_REGEX = re.compile(r"[\w\u0900-\u0DFF\u200c\u200d]+|[^\w\s]")
+
+
+class Span(NamedTuple):
+    """One entity found in a text: ``text[start:end]`` is where it sits, ``value`` its normalized form."""
+    start: int
+    end: int
+    label: str
+    source: str
+    value: str
+
+
+class Document:
+    """A text plus its segmentation, computed once and shared by every extractor that needs it.
+
+    All offsets are character offsets into ``text``.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def sentences(self) -> List[Tuple[int, int]]:
+        """(start, end) of each non-blank segment, with surrounding whitespace trimmed."""
+        spans = []
+        text = self.text
+        for m in SEGMENT_REGEX.finditer(text):
+            start, end = m.span()
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if start < end:
+                spans.append((start, end))
+        return spans
+
+    @cached_property
+    def sentence_words(self) -> List[List[Tuple[int, int]]]:
+        """(start, end) of each word, grouped by sentence."""
+        return [[m.span() for m in WORD_REGEX.finditer(self.text, start, end)]
+                for start, end in self.sentences]
+
+    def sentence_texts(self) -> List[str]:
+        return [self.text[start:end] for start, end in self.sentences]
+
+
+@lru_cache(maxsize=4)
+def get_document(text: str) -> Document:
+    """Shared Document for a text; the last few are kept so extractors reuse one segmentation."""
+    return Document(text)
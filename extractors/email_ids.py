@@ -1,9 +1,13 @@
 import re
 from typing import List
+from extractors.document import Span
 from extractors.logger import get_logger
+from extractors.scanner import scan_text
 
 logger = get_logger("EmailExtractor")
 
+EXTRACTOR_VERSION = "1"
+
 EMAIL_REGEX = re.compile(
     r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',
     re.IGNORECASE
@@ -20,10 +24,12 @@ def is_valid_email(email: str) -> bool:
     except Exception:
         return False
 
+def extract_email_spans(text: str) -> List[Span]:
+    return [Span(start, end, "EMAIL", "scanner", email.strip()) for start, end, email in scan_text(text).emails]
+
 def extract_emails(text: str) -> List[str]:
-    logger.info("Extracting email addresses...")
-    matches = EMAIL_REGEX.findall(text)
-    valid_emails = {email.strip() for email in matches}
-    logger.info(f"Valid emails extracted: {len(valid_emails)}")
+    logger.debug("Extracting email addresses...")
+    valid_emails = {span.value for span in extract_email_spans(text)}
+    logger.debug(f"Valid emails extracted: {len(valid_emails)}")
     return sorted(valid_emails)
 
@@ -0,0 +1,242 @@
+"""Persistent inverted index of extracted entities: normalized value -> documents and offsets.
+
+    python main.py files --index entities.sqlite3               # filled while extracting
+    python -m extractors.entity_index load entities.sqlite3 files --only pan_gstin bank phones
+    python -m extractors.entity_index query entities.sqlite3 AAACS1234F
+    python -m extractors.entity_index query entities.sqlite3 "M/S. SETHI" --prefix --label ORG
+    python -m extractors.entity_index stats entities.sqlite3
+
+Entities live in one SQLite table whose primary key starts with the normalized value
+(WITHOUT ROWID, so the rows are stored in value order). A point lookup is one B-tree seek
+and a prefix query one range scan.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from extractors.document import Span
+from extractors.logger import get_logger
+
+logger = get_logger("EntityIndex")
+
+DEFAULT_INDEX_PATH = os.environ.get("ENTITY_INDEX_PATH", os.path.join(".cache", "entities.sqlite3"))
+
+# Buffered rows written in one transaction; a batch run then commits rarely
+INDEX_FLUSH_ROWS = 50_000
+DEFAULT_QUERY_LIMIT = 100
+
+
+class Hit(NamedTuple):
+    value: str
+    label: str
+    path: str
+    start: int
+    end: int
+
+
+def normalize_value(value: str) -> str:
+    """Key under which an entity is stored and looked up: whitespace collapsed, upper case."""
+    return " ".join(value.split()).upper()
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``.
+
+    SQLite compares TEXT as UTF-8 bytes, which orders like code points.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class EntityIndex:
+    """SQLite-backed inverted index of entity spans per document.
+
+    ``add_document`` buffers a document's spans; they are written, replacing that
+    document's earlier rows for the same extractors, at the next ``flush`` (or once
+    INDEX_FLUSH_ROWS rows are pending). Several processes may write to one index.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, flush_rows: int = INDEX_FLUSH_ROWS):
+        self.path = path
+        self.flush_rows = flush_rows
+        self._pending: List[Tuple[str, Dict[str, List[Span]]]] = []
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, indexed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "value TEXT NOT NULL, label TEXT NOT NULL, doc_id INTEGER NOT NULL, "
+            "start INTEGER NOT NULL, end INTEGER NOT NULL, extractor TEXT NOT NULL, "
+            "PRIMARY KEY (value, label, doc_id, start)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entities_by_document ON entities (doc_id, extractor)")
+
+    def add_document(self, path: str, spans_by_extractor: Dict[str, List[Span]]):
+        """Queue a document's spans, keyed by the extractor that found them."""
+        with self._lock:
+            self._pending.append((os.path.abspath(path), spans_by_extractor))
+            self._pending_rows += sum(len(spans) for spans in spans_by_extractor.values())
+            if self._pending_rows >= self.flush_rows:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for path, spans_by_extractor in self._pending:
+                conn.execute("INSERT INTO documents (path, indexed) VALUES (?, ?) "
+                             "ON CONFLICT(path) DO UPDATE SET indexed = excluded.indexed", (path, now))
+                doc_id = conn.execute("SELECT doc_id FROM documents WHERE path = ?", (path,)).fetchone()[0]
+                for extractor, spans in spans_by_extractor.items():
+                    conn.execute("DELETE FROM entities WHERE doc_id = ? AND extractor = ?", (doc_id, extractor))
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO entities (value, label, doc_id, start, end, extractor) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        ((normalize_value(span.value), span.label, doc_id, span.start, span.end, extractor)
+                         for span in spans if span.value.strip())
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending.clear()
+        self._pending_rows = 0
+
+    def bulk_load(self, documents: Iterable[Tuple[str, Dict[str, List[Span]]]]):
+        """Index many documents with durability relaxed until the load finishes."""
+        self._conn.execute("PRAGMA synchronous=OFF")
+        try:
+            for path, spans_by_extractor in documents:
+                self.add_document(path, spans_by_extractor)
+            self.flush()
+        finally:
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def has_document(self, path: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents WHERE path = ?",
+                                      (os.path.abspath(path),)).fetchone() is not None
+
+    def lookup(self, value: str, label: Optional[str] = None, limit: int = DEFAULT_QUERY_LIMIT) -> List[Hit]:
+        """Every place an entity with exactly this (normalized) value was found."""
+        key = normalize_value(value)
+        return self._query("e.value = ?", (key,), label, limit)
+
+    def prefix(self, prefix: str, label: Optional[str] = None, limit: int = DEFAULT_QUERY_LIMIT) -> List[Hit]:
+        """Every place an entity whose normalized value starts with ``prefix`` was found."""
+        key = normalize_value(prefix)
+        if not key:
+            return []
+        return self._query("e.value >= ? AND e.value < ?", (key, _prefix_upper_bound(key)), label, limit)
+
+    def _query(self, condition: str, params: tuple, label: Optional[str], limit: int) -> List[Hit]:
+        sql = ("SELECT e.value, e.label, d.path, e.start, e.end FROM entities e "
+               f"JOIN documents d ON d.doc_id = e.doc_id WHERE {condition}")
+        if label:
+            sql += " AND e.label = ?"
+            params += (label.upper(),)
+        sql += " ORDER BY e.value, e.label, e.doc_id, e.start LIMIT ?"
+        with self._lock:
+            return [Hit(*row) for row in self._conn.execute(sql, params + (limit,))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            by_label = dict(self._conn.execute("SELECT label, COUNT(*) FROM entities GROUP BY label ORDER BY label"))
+        return {"documents": documents, "entities": sum(by_label.values()), "by_label": by_label}
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+_indexes = {}
+
+
+def get_entity_index(path: str) -> EntityIndex:
+    """One EntityIndex per path and process (connections are never shared across a fork)."""
+    key = (path, os.getpid())
+    if key not in _indexes:
+        _indexes[key] = EntityIndex(path)
+    return _indexes[key]
+
+
+def _iter_folder_spans(folder: str, only: Optional[List[str]]):
+    from extractors.pipeline import extract_spans_by_extractor
+
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if not (entry.name.endswith(".txt") and entry.is_file()):
+            continue
+        with open(entry.path, "r", encoding="utf-8") as f:
+            text = f.read()
+        yield entry.path, extract_spans_by_extractor(text, only)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query or fill the corpus-level entity index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="Documents mentioning an entity")
+    query.add_argument("index")
+    query.add_argument("value")
+    query.add_argument("--prefix", action="store_true", help="Match every value starting with VALUE")
+    query.add_argument("--label", default=None, help="Only this span label, e.g. PAN, GSTIN, IFSC, MOBILE, ORG")
+    query.add_argument("--limit", type=int, default=DEFAULT_QUERY_LIMIT)
+
+    load = commands.add_parser("load", help="Bulk-index the .txt files of a folder")
+    load.add_argument("index")
+    load.add_argument("folder")
+    load.add_argument("--only", nargs="*", default=None, help="Extractors to index (default: all)")
+
+    stats = commands.add_parser("stats", help="Document and entity counts")
+    stats.add_argument("index")
+    args = parser.parse_args(argv)
+
+    if args.command != "load" and not os.path.exists(args.index):
+        logger.error(f"Index not found: {args.index}")
+        return 1
+    index = EntityIndex(args.index)
+    try:
+        if args.command == "query":
+            start = time.perf_counter()
+            find = index.prefix if args.prefix else index.lookup
+            hits = find(args.value, args.label, args.limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for hit in hits:
+                print(f"{hit.value}\t{hit.label}\t{hit.path}\t{hit.start}-{hit.end}")
+            print(f"{len(hits)} hits in {elapsed_ms:.2f} ms", file=sys.stderr)
+        elif args.command == "load":
+            start = time.perf_counter()
+            index.bulk_load(_iter_folder_spans(args.folder, args.only))
+            logger.info(f"📚 Indexed {args.folder} in {time.perf_counter() - start:.2f}s")
+        else:
+            summary = index.stats()
+            print(f"documents: {summary['documents']}\nentities: {summary['entities']}")
+            for label, count in summary["by_label"].items():
+                print(f"  {label}: {count}")
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
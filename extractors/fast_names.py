@@ -0,0 +1,142 @@
+"""Model-free person candidates for the "fast" names mode.
+
+Two cheap sources, both pure regex and set lookups:
+
+* honorific and relation anchors (Shri, Smt., Sh., Mr., Dr., S/o, W/o, ...) followed by
+  up to four capitalized words or initials;
+* runs of capitalized words containing a given name or surname from a compact gazetteer
+  of common Indian names.
+
+Candidates still go through the filters of extractors.names (is_valid_name, the org and
+location checks), exactly like IndicNER and Flair candidates do.
+"""
+import re
+from typing import List
+from extractors.document import Span
+
+# Widespread given names and surnames across Indian regions and communities, lower-cased so
+# lookups are one set membership test per word. Names only seen in the sample documents under
+# files/ are deliberately left out, so the fast-mode recall measured on them stays honest.
+GIVEN_NAMES = frozenset("""
+aarti abhay abhishek aditi aditya ajay ajit akash akhil alok amar amit amita amrita anand anil anita anjali
+ankit anupam anuradha arjun arun aruna arvind asha ashok ashwin atul bharat bhavna chandra chetan deepa
+deepak devendra dinesh divya farhan gaurav geeta girish gopal govind hari harish hemant indira irfan jagdish
+jaya jayant jitendra jyoti kamal kavita kiran krishna kunal lakshmi lalit madhu mahesh manish manoj
+meena mehul mohan mohit mukesh nagesh naresh naveen neha nikhil nirmala nitin pankaj parveen pooja prakash
+pramod pranav prasad praveen priya rahul raj rajan rajesh rajiv rakesh ram ramesh rani ravi rekha rohit
+sachin sai sandeep sangeeta sanjay santosh sarita satish seema shanti shankar shiv shyam sneha
+subhash sudha sunil sunita suresh swati tarun uma usha varun vijay vikas vikram vinay vinod vishal yash
+yogesh gita sita imran salim rashid ayesha fatima joseph thomas george mary
+""".split())
+
+SURNAMES = frozenset("""
+agarwal ahmed ali bajaj banerjee bansal basu bhat bhatia bose chakraborty chatterjee chauhan chopra das
+desai deshmukh dubey dutta gandhi ghosh goel gupta hegde iyer iyengar jain jha joshi kapoor khan khanna
+kulkarni kumar kumari malhotra mehta menon mishra mukherjee naidu nair nath pandey patel patil pillai
+prasad rao rathore reddy roy saxena sen shah sharma shetty shukla singh sinha srivastava tiwari
+trivedi varma verma yadav bhattacharya chaudhary choudhury dixit gowda kaur mahajan pandit qureshi rajput
+saini shaikh thakur tripathi
+""".split())
+
+# Capitalized words that sit next to names in legal text but are never part of one
+NOT_NAME_WORDS = frozenset("""
+the this that these those and of for in on at to by with from a an no sir madam hon'ble honble
+court high supreme tribunal bench section act order rule state central union government india police
+station district road street nagar village proprietor partner director manager officer commissioner
+appellant respondent petitioner accused complainant noticee counsel advocate witness late
+shri shrimati smt sh kumari km mr mrs ms dr
+limited ltd pvt private company enterprises industries traders textiles exports imports technologies
+cement factory house group services systems corporation bank trust llp
+""".split())
+
+# Words that mark a capitalized run as an organization name rather than a person
+ORG_RUN_WORDS = frozenset("""
+limited ltd pvt private company enterprises industries traders textiles exports imports technologies
+cement factory house group services systems corporation bank trust llp associates agencies
+products chemicals industry works mills stores motors pharma logistics solutions
+""".split())
+
+# One space or tab run, or a single line break (names are often wrapped across lines)
+_GAP = r"(?:[ \t]+\n?[ \t]*|\n[ \t]*)"
+_NAME_WORD = r"(?:[A-Z][a-z]+|[A-Z]\.)"
+_ANCHOR = r"(?:Shri|Shrimati|Smt|Sh|Kumari|Km|Mr|Mrs|Ms|Dr|Late|[SDW]/o)\.?"
+
+# Anchors chain: "W/o Shri Ram Prasad", "S/o Late Shri Mohan Lal"
+HONORIFIC_PERSON_REGEX = re.compile(
+    rf"(?<![\w/]){_ANCHOR}{_GAP}(?:{_ANCHOR}{_GAP})*"
+    rf"({_NAME_WORD}(?:{_GAP}{_NAME_WORD}){{0,3}})(?![\w])"
+)
+CAPITALIZED_RUN_REGEX = re.compile(rf"(?<![\w.]){_NAME_WORD}(?:{_GAP}{_NAME_WORD})+(?![\w])")
+NAME_WORD_REGEX = re.compile(_NAME_WORD)
+
+
+def _is_name_word(word: str) -> bool:
+    return word.lower().rstrip(".") not in NOT_NAME_WORDS
+
+
+def _person_span(text: str, words: list, first: int, last: int, source: str) -> Span:
+    start, end = words[first].start(), words[last].end()
+    return Span(start, end, "PER", source, " ".join(text[start:end].split()))
+
+
+def honorific_people(text: str) -> List[Span]:
+    """People introduced by an honorific or a relation (S/o, D/o, W/o)."""
+    people = []
+    for match in HONORIFIC_PERSON_REGEX.finditer(text):
+        words = [w for w in NAME_WORD_REGEX.finditer(text, match.start(1), match.end(1))]
+        first = 0
+        while first < len(words) and not _is_name_word(words[first].group(0)):
+            first += 1
+        last = first - 1
+        while last + 1 < len(words) and _is_name_word(words[last + 1].group(0)):
+            last += 1
+        if last - first >= 1:
+            people.append(_person_span(text, words, first, last, "honorific"))
+    return people
+
+
+def gazetteer_people(text: str) -> List[Span]:
+    """People in capitalized runs, anchored on a gazetteer given name or surname.
+
+    A known given name takes the unknown word after it as a surname, and a known surname
+    takes the unknown word before it as a given name; initials in front are kept.
+    """
+    people = []
+    for run in CAPITALIZED_RUN_REGEX.finditer(text):
+        words = list(NAME_WORD_REGEX.finditer(text, run.start(), run.end()))
+        lowered = [w.group(0).lower() for w in words]
+        if any(word in ORG_RUN_WORDS for word in lowered):
+            continue
+        n = len(words)
+        i = 0
+        free = 0  # words before this index are already part of a person
+        while i < n:
+            if lowered[i] not in GIVEN_NAMES and lowered[i] not in SURNAMES:
+                i += 1
+                continue
+            first = last = i
+            while last + 1 < n and (lowered[last + 1] in GIVEN_NAMES or lowered[last + 1] in SURNAMES):
+                last += 1
+            if first == last:
+                if lowered[first] in GIVEN_NAMES and last + 1 < n and _is_name_word(lowered[last + 1]) \
+                        and not lowered[last + 1].endswith("."):
+                    last += 1
+                elif first > free and _is_name_word(lowered[first - 1]) and not lowered[first - 1].endswith("."):
+                    first -= 1
+            while first > free and lowered[first - 1].endswith("."):
+                first -= 1
+            if last > first:
+                people.append(_person_span(text, words, first, last, "gazetteer"))
+            free = i = last + 1
+    return people
+
+
+def fast_person_candidates(text: str) -> List[Span]:
+    """Honorific and gazetteer person candidates; of overlapping ones, the leftmost (then longest) is kept."""
+    candidates = []
+    covered = 0
+    for span in sorted(honorific_people(text) + gazetteer_people(text), key=lambda s: (s.start, s.start - s.end)):
+        if span.start >= covered:
+            candidates.append(span)
+            covered = span.end
+    return candidates
@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from extractors.logger import get_logger
+from extractors.metrics import metrics
+
+logger = get_logger("LlamaClient")
+
+DEFAULT_TIMEOUT = (5.0, 120.0)  # (connect, read) seconds
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5           # seconds, doubled after every failed attempt
+DEFAULT_CONCURRENCY = 8
+
+# Statuses worth retrying; anything else non-200 is a permanent failure
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LlamaClient:
+    """Thread-safe client for the local LLaMA generate endpoint.
+
+    Keeps one pooled HTTP session, caps the number of requests in flight and
+    retries transient failures with exponential backoff.
+    """
+
+    def __init__(self, url: str, model: str, timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 max_concurrency: int = DEFAULT_CONCURRENCY):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def generate(self, prompt: str) -> Optional[str]:
+        """Return the model's raw response text, or None once all retries are spent."""
+        payload = {"model": self.model, "prompt": prompt, "stream": False}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._slots, metrics.timer("llm.request", len(prompt)):
+                    response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            else:
+                if response.status_code == 200:
+                    try:
+                        body = response.json()
+                    except ValueError as e:
+                        # A proxy error page or a truncated body: the same again is unlikely to help
+                        logger.error(f"❌ LLaMA response is not JSON: {e}")
+                        return None
+                    if not isinstance(body, dict):
+                        logger.error(f"❌ Unexpected LLaMA response: {str(body)[:200]}")
+                        return None
+                    return str(body.get("response", "")).strip()
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUSES:
+                    break
+
+            if attempt < self.max_retries:
+                delay = self.backoff * (2 ** attempt)
+                logger.warning(f"LLaMA request failed ({error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        logger.error(f"❌ LLaMA request failed: {error}")
+        return None
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from extractors.logger import get_logger
+from extractors.results import DocumentResult
+
+logger = get_logger("Manifest")
+
+MANIFEST_FILE = "manifest.sqlite3"
+RECORDS_DIR = "records"
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Per-file record of the last extraction: content hash, extractor versions and output location.
+
+    Backed by SQLite in ``state_dir`` so several worker processes can read and update it;
+    the stored results live next to it as one JSON record per content hash.
+    """
+
+    def __init__(self, state_dir: str):
+        self.state_dir = state_dir
+        self.records_dir = os.path.join(state_dir, RECORDS_DIR)
+        os.makedirs(self.records_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(state_dir, MANIFEST_FILE), timeout=60,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, versions TEXT NOT NULL, "
+            "output TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def get(self, path: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, versions, output FROM files WHERE path = ?", (os.path.abspath(path),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"sha256": row[0], "versions": json.loads(row[1]), "output": row[2]}
+
+    def update(self, path: str, sha256: str, versions: dict, output: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, sha256, versions, output, updated) VALUES (?, ?, ?, ?, ?)",
+                (os.path.abspath(path), sha256, json.dumps(versions, sort_keys=True), output, time.time())
+            )
+
+    def record_path(self, sha256: str) -> str:
+        return os.path.join(self.records_dir, sha256[:2], f"{sha256}.json")
+
+    def load_record(self, output: str) -> Optional[DocumentResult]:
+        try:
+            with open(output, "r", encoding="utf-8") as f:
+                return DocumentResult.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable stored result {output}: {e}")
+            return None
+
+    def save_record(self, sha256: str, result: DocumentResult) -> str:
+        """Write a result atomically under its content hash and return its path."""
+        output = self.record_path(sha256)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        tmp = f"{output}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, output)
+        return output
+
+    def close(self):
+        self._conn.close()
+
+
+_manifests = {}
+
+
+def get_manifest(state_dir: str) -> Manifest:
+    """One Manifest per state directory and process (connections are never shared across a fork)."""
+    key = (state_dir, os.getpid())
+    if key not in _manifests:
+        _manifests[key] = Manifest(state_dir)
+    return _manifests[key]
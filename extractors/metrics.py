@@ -0,0 +1,177 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process so far, in KiB (0 where unsupported)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class StageStats:
+    """Aggregate timings of one named stage: an extractor, a model forward pass, an LLM call...
+
+    ``process_peak_rss_kb`` is the peak RSS of the whole process when the stage last
+    finished, not memory used by the stage: it only ever grows, and covers every stage
+    and thread that ran before.
+    """
+
+    __slots__ = ("calls", "wall", "wall_max", "cpu", "bytes", "entities", "process_peak_rss_kb")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.wall_max = 0.0
+        self.cpu = 0.0
+        self.bytes = 0
+        self.entities = 0
+        self.process_peak_rss_kb = 0
+
+    def add(self, calls: int, wall: float, cpu: float, nbytes: int, entities: int,
+            rss_kb: int, wall_max: Optional[float] = None):
+        self.calls += calls
+        self.wall += wall
+        self.wall_max = max(self.wall_max, wall if wall_max is None else wall_max)
+        self.cpu += cpu
+        self.bytes += nbytes
+        self.entities += entities
+        self.process_peak_rss_kb = max(self.process_peak_rss_kb, rss_kb)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Measurement:
+    """Handed out by Metrics.timer so the caller can report what the timed block produced."""
+
+    __slots__ = ("bytes", "entities")
+
+    def __init__(self, nbytes: int = 0):
+        self.bytes = nbytes
+        self.entities = 0
+
+
+class Metrics:
+    """Process-wide collector of per-stage and per-document timings.
+
+    CPU time is process CPU time, so it includes model threads; when several threads
+    run stages at once it is shared between them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stages: Dict[str, StageStats] = {}
+        self.documents: List[dict] = []
+
+    @contextmanager
+    def timer(self, name: str, nbytes: int = 0):
+        measurement = Measurement(nbytes)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield measurement
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self.record(name, wall, cpu, measurement.bytes, measurement.entities)
+
+    def record(self, name: str, wall: float, cpu: float = 0.0, nbytes: int = 0, entities: int = 0):
+        rss_kb = peak_rss_kb()
+        with self._lock:
+            self.stages.setdefault(name, StageStats()).add(1, wall, cpu, nbytes, entities, rss_kb)
+        document = getattr(self._local, "document", None)
+        if document is not None:
+            document["stages"][name] = document["stages"].get(name, 0.0) + wall
+
+    @contextmanager
+    def document(self, file: str, nbytes: int = 0):
+        """Time one document; stages timed in this thread meanwhile are attributed to it."""
+        record = {"file": file, "bytes": nbytes, "entities": 0, "stages": {}}
+        self._local.document = record
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            self._local.document = None
+            record["wall"] = time.perf_counter() - wall_start
+            record["cpu"] = time.process_time() - cpu_start
+            record["process_peak_rss_kb"] = peak_rss_kb()
+            with self._lock:
+                self.documents.append(record)
+
+    def stage_stats(self) -> Dict[str, dict]:
+        """Current per-stage totals, without resetting them."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.stages.items()}
+
+    def drain(self) -> dict:
+        """Return everything recorded so far and reset, e.g. to ship a worker's metrics to its parent."""
+        with self._lock:
+            snapshot = {
+                "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+                "documents": self.documents,
+            }
+            self.stages = {}
+            self.documents = []
+        return snapshot
+
+    def merge(self, snapshot: dict):
+        with self._lock:
+            for name, s in snapshot["stages"].items():
+                self.stages.setdefault(name, StageStats()).add(
+                    s["calls"], s["wall"], s["cpu"], s["bytes"], s["entities"], s["process_peak_rss_kb"], s["wall_max"]
+                )
+            self.documents.extend(snapshot["documents"])
+
+    def summary_table(self) -> str:
+        """Per-stage totals; "proc peak MB" is the process peak RSS when the stage last finished."""
+        header = f"{'stage':<28}{'calls':>8}{'wall s':>10}{'avg ms':>10}{'max ms':>10}{'cpu s':>10}{'MB/s':>9}{'entities':>10}{'proc peak MB':>13}"
+        lines = [header, "-" * len(header)]
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1].wall, reverse=True)
+            documents = list(self.documents)
+        for name, s in stages:
+            avg_ms = 1000 * s.wall / s.calls if s.calls else 0.0
+            throughput = s.bytes / s.wall / 2**20 if s.wall and s.bytes else 0.0
+            lines.append(
+                f"{name:<28}{s.calls:>8}{s.wall:>10.2f}{avg_ms:>10.1f}{1000 * s.wall_max:>10.1f}"
+                f"{s.cpu:>10.2f}{throughput:>9.2f}{s.entities:>10}{s.process_peak_rss_kb / 1024:>13.0f}"
+            )
+        if documents:
+            wall = sum(d["wall"] for d in documents)
+            nbytes = sum(d["bytes"] for d in documents)
+            lines.append("-" * len(header))
+            lines.append(
+                f"{'documents':<28}{len(documents):>8}{wall:>10.2f}{1000 * wall / len(documents):>10.1f}"
+                f"{1000 * max(d['wall'] for d in documents):>10.1f}{sum(d['cpu'] for d in documents):>10.2f}"
+                f"{(nbytes / wall / 2**20 if wall else 0.0):>9.2f}{sum(d['entities'] for d in documents):>10}"
+                f"{max(d['process_peak_rss_kb'] for d in documents) / 1024:>13.0f}"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: str, **run_info):
+        with self._lock:
+            data = {
+                "run": run_info,
+                "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+                "documents": self.documents,
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+
+
+# Process-wide collector used by every extractor
+metrics = Metrics()
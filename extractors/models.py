@@ -0,0 +1,102 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from extractors.logger import get_logger
+from extractors.metrics import metrics
+from extractors.ner_backends import NER_BACKENDS, TorchBackend, load_onnx_backend
+
+logger = get_logger("ModelRegistry")
+
+INDIC_MODEL = "ai4bharat/IndicNER"
+FLAIR_MODEL = "ner"
+
+# IndicNER inference backend: torch, onnx or onnx-int8
+INDIC_BACKEND = os.environ.get("INDIC_NER_BACKEND", "torch")
+
+
+def _load_device():
+    import torch
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+
+class ModelRegistry:
+    """Loads each NER model on first use and keeps it for the rest of the process."""
+
+    def __init__(self, indic_backend: str = INDIC_BACKEND):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Any] = {}
+        self.indic_backend = indic_backend
+        self.threads = 0  # CPU threads for ONNX Runtime sessions; 0 leaves the runtime default
+
+    def configure(self, indic_backend: Optional[str] = None, threads: Optional[int] = None):
+        """Change the defaults used by models loaded from now on."""
+        if indic_backend is not None:
+            if indic_backend not in NER_BACKENDS:
+                raise ValueError(f"Unknown NER backend: {indic_backend} (choose from {', '.join(NER_BACKENDS)})")
+            self.indic_backend = indic_backend
+        if threads is not None:
+            self.threads = threads
+
+    def _get(self, name: str, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    with metrics.timer(f"model.load.{name}"):
+                        model = loader()
+                    self._models[name] = model
+        return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def device(self):
+        return self._get("device", _load_device)
+
+    def indic(self, backend: Optional[str] = None) -> Tuple[Any, Any, Dict[int, str]]:
+        """Return (tokenizer, NerBackend, id2label) for IndicNER on the given or configured backend."""
+        backend = backend or self.indic_backend
+        if backend not in NER_BACKENDS:
+            raise ValueError(f"Unknown NER backend: {backend} (choose from {', '.join(NER_BACKENDS)})")
+        return self._get(f"indic.{backend}", lambda: self._load_indic(backend))
+
+    def flair(self):
+        return self._get("flair", self._load_flair)
+
+    def load_all(self):
+        self.indic()
+        self.flair()
+
+    def _load_indic(self, backend: str):
+        from transformers import AutoConfig, AutoTokenizer, AutoModelForTokenClassification
+
+        tokenizer = AutoTokenizer.from_pretrained(INDIC_MODEL)
+        id2label = AutoConfig.from_pretrained(INDIC_MODEL).id2label
+        if backend == "torch":
+            device = self.device()
+            logger.info(f"Loading IndicNER on {device}")
+            model = AutoModelForTokenClassification.from_pretrained(INDIC_MODEL).to(device)
+            model.eval()
+            runner = TorchBackend(model, device)
+        else:
+            logger.info(f"Loading IndicNER with ONNX Runtime ({backend})")
+            runner = load_onnx_backend(
+                INDIC_MODEL, backend == "onnx-int8",
+                lambda: AutoModelForTokenClassification.from_pretrained(INDIC_MODEL),
+                threads=self.threads,
+            )
+        logger.info("✅ IndicNER loaded")
+        return tokenizer, runner, id2label
+
+    def _load_flair(self):
+        from flair.models import SequenceTagger
+
+        logger.info("Loading Flair NER...")
+        tagger = SequenceTagger.load(FLAIR_MODEL).to(self.device())
+        logger.info("✅ Flair NER loaded")
+        return tagger
+
+
+# Process-wide registry shared by all extractors
+models = ModelRegistry()
@@ -1,28 +1,51 @@
-from typing import List, Tuple
-from transformers import AutoTokenizer, AutoModelForTokenClassification
-from flair.models import SequenceTagger
-from flair.data import Sentence
-import torch
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import os
 import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_right
+from collections import OrderedDict
 from difflib import SequenceMatcher
+from functools import lru_cache
+from extractors.dedup import AhoCorasick, deduplicate_by_substring
+from extractors.document import Span, get_document
+from extractors.fast_names import fast_person_candidates
 from extractors.logger import get_logger
+from extractors.metrics import metrics
+from extractors.models import models
 
 logger = get_logger("HybridNER")
 
-# Load IndicNER
-INDIC_MODEL = "ai4bharat/IndicNER"
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+EXTRACTOR_VERSION = "4"
 
-logger.info(f"Loading IndicNER on {device}")
-indic_tokenizer = AutoTokenizer.from_pretrained(INDIC_MODEL)
-indic_model = AutoModelForTokenClassification.from_pretrained(INDIC_MODEL).to(device)
-id2label = indic_model.config.id2label
-logger.info("✅ IndicNER loaded")
+# IndicNER and Flair are loaded on first use through the shared model registry
 
-# Load Flair NER
-logger.info("Loading Flair NER...")
-flair_tagger = SequenceTagger.load("ner").to(device)
-logger.info("✅ Flair NER loaded")
+# Batched inference settings
+INDIC_MAX_LENGTH = 512
+INDIC_BATCH_SIZE = 32          # max chunks per IndicNER forward pass
+INDIC_MAX_BATCH_TOKENS = 8192  # max padded tokens (rows x longest row) per forward pass
+FLAIR_BATCH_SIZE = 32
+NAMES_CACHE_SIZE = 4  # documents whose resolved names are kept for the string and span views
+
+# hybrid: IndicNER + Flair + org regexes; fast: honorific/gazetteer people + org regexes, no models
+NAMES_MODES = ("hybrid", "fast")
+NAMES_MODE = os.environ.get("NAMES_MODE", "hybrid")
+
+# IndicNER input mode: "windows" runs the whole text in overlapping 512-token windows;
+# "chunks" runs every chunk_text piece separately, truncated at INDIC_MAX_LENGTH tokens
+INDIC_NER_MODES = ("windows", "chunks")
+INDIC_NER_MODE = os.environ.get("INDIC_NER_MODE", "windows")
+INDIC_WINDOW_STRIDE = 128  # tokens shared by consecutive windows
+
+# Pre-NER gate: is_valid_name and is_clean_org both need two capitalized words, so runs of
+# sentences with fewer (and no Indic script) never reach the models; runs seen before reuse the memo
+NER_PREFILTER = os.environ.get("NER_PREFILTER", "1") != "0"
+GATE_MIN_CHARS = 16  # shorter pieces ("Dr", "M/s") always go to NER, as cheap context
+CHUNK_MEMO_SIZE = int(os.environ.get("NER_CHUNK_MEMO_SIZE", 4096))
+INDIC_SCRIPT_REGEX = re.compile(r"[\u0900-\u0DFF]")
+WORD_START_REGEX = re.compile(r"(?<!\w)[^\W\d_]")
+SENTENCE_END_REGEX = re.compile(r"[.;]|\n\s*\n")  # what ends a run: a full stop, semicolon or blank line
 
 # Keywords for ORG classification
 ORG_KEYWORDS = {
@@ -39,6 +62,17 @@ ADDRESS_WORDS = {
 
 NARRATIVE_VERBS = {"said", "added", "told", "confessed", "loaded", "driven", "stated", "mentioned", "reported"}
 
+LOCATION_WORDS = {"chowk", "road", "bazar", "chowpathy", "nagar", "block", "district", "market", "lane"}
+
+# Keyword sets matched (case-insensitively, as substrings) by a single automaton pass per candidate
+KEYWORD_SETS = {
+    "org": ORG_KEYWORDS,
+    "address": ADDRESS_WORDS,
+    "narrative": NARRATIVE_VERBS,
+    "location": LOCATION_WORDS,
+}
+KEYWORD_CACHE_SIZE = 65536
+
 # Regex for fallback orgs
 PRIVATE_ORG_REGEX = re.compile(
     r"\b([A-Z][A-Za-z0-9&.\-]*\s(?:Enterprises|Industries|Technologies|Consultants|Corporation|Group|Exports|Services|Systems))\b",
@@ -54,6 +88,11 @@ CEMENT_LIKE_REGEX = re.compile(
     r"\b([A-Z][\w\s&.,\-()]{2,}?(?:Cement|Factory|House|Corporation|Industries|Group))\b",
     re.IGNORECASE
 )
+# CEMENT_LIKE_REGEX retries every word start up to the next keyword, which is quadratic on
+# long prose; cement_like_matches finds the same matches with these three in one pass
+CEMENT_LIKE_START_REGEX = re.compile(r"\b[A-Z]", re.IGNORECASE)
+CEMENT_LIKE_KEYWORD_REGEX = re.compile(r"(?:Cement|Factory|House|Corporation|Industries|Group)\b", re.IGNORECASE)
+CEMENT_LIKE_STOP_REGEX = re.compile(r"[^\w\s&.,\-()]")
 
 # Improved M/s. pattern to avoid trailing clause text
 MS_ORG_REGEX = re.compile(
@@ -61,7 +100,7 @@ MS_ORG_REGEX = re.compile(
 )
 
 def chunk_text(text: str) -> List[str]:
-    return [line.strip() for line in re.split(r'[\n;.]+', text) if line.strip()]
+    return get_document(text).sentence_texts()
 
 def clean_entity(e: str) -> str:
     return re.sub(r"\s+", " ", e.strip())
@@ -72,14 +111,106 @@ def is_valid_name(name: str) -> bool:
     words = name.split()
     return len(words) >= 2 and sum(w[0].isupper() for w in words if w) >= 2
 
+def normalize_chunk(chunk: str) -> str:
+    """NFKC-normalized chunk with whitespace runs collapsed: the gate's input and the memo key."""
+    return " ".join(unicodedata.normalize("NFKC", chunk).split())
+
+def has_name_candidates(chunk: str) -> bool:
+    """Whether a chunk has Indic script or at least two capitalized words."""
+    if INDIC_SCRIPT_REGEX.search(chunk):
+        return True
+    capitals = 0
+    for match in WORD_START_REGEX.finditer(chunk):
+        if match.group(0).isupper():
+            capitals += 1
+            if capitals >= 2:
+                return True
+    return False
+
+class ChunkMemo:
+    """LRU map of normalized chunk -> (chunk text, NER candidates with offsets relative to the chunk)."""
+
+    def __init__(self, size: int = CHUNK_MEMO_SIZE):
+        self.size = size
+        self._items: "OrderedDict[tuple, Tuple[str, Tuple[Span, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Tuple[str, Tuple[Span, ...]]]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: Tuple[str, Tuple[Span, ...]]):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+class PrefilterStats:
+    """Running totals of what the pre-NER gate did with each sentence."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.skipped = 0
+        self.memo_hits = 0
+        self.documents = 0
+        self._lock = threading.Lock()
+
+    def add(self, documents: int, chunks: int, skipped: int, memo_hits: int):
+        with self._lock:
+            self.documents += documents
+            self.chunks += chunks
+            self.skipped += skipped
+            self.memo_hits += memo_hits
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            chunks = self.chunks
+            return {
+                "documents": self.documents,
+                "chunks": chunks,
+                "skipped": self.skipped,
+                "memo_hits": self.memo_hits,
+                "to_ner": chunks - self.skipped - self.memo_hits,
+                "skip_rate": self.skipped / chunks if chunks else 0.0,
+                "memo_rate": self.memo_hits / chunks if chunks else 0.0,
+            }
+
+chunk_memo = ChunkMemo()
+prefilter_stats = PrefilterStats()
+
+def _build_keyword_index() -> Tuple[AhoCorasick, Dict[str, FrozenSet[str]]]:
+    categories: Dict[str, set] = {}
+    for category, words in KEYWORD_SETS.items():
+        for word in words:
+            categories.setdefault(word.lower(), set()).add(category)
+    return AhoCorasick(categories), {word: frozenset(c) for word, c in categories.items()}
+
+KEYWORD_AUTOMATON, KEYWORD_CATEGORIES = _build_keyword_index()
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def keyword_features(text: str) -> FrozenSet[str]:
+    """Names of the KEYWORD_SETS with at least one keyword occurring in the text."""
+    features = set()
+    for word in KEYWORD_AUTOMATON.iter_matches(text.lower()):
+        features |= KEYWORD_CATEGORIES[word]
+    return frozenset(features)
+
 def is_probable_org(text: str) -> bool:
-    if any(word in text.lower() for word in ADDRESS_WORDS):
-        return False
-    count = sum(kw in text.lower() for kw in ORG_KEYWORDS)
-    return count >= 1
+    features = keyword_features(text)
+    return "org" in features and "address" not in features
 
 def is_location_like(name: str) -> bool:
-    return any(x.lower() in name.lower() for x in ["chowk", "road", "bazar", "chowpathy", "nagar", "block", "district", "market", "lane"])
+    return "location" in keyword_features(name)
 
 def is_clean_org(org: str) -> bool:
     org = org.strip()
@@ -87,7 +218,7 @@ def is_clean_org(org: str) -> bool:
         return False
     if re.match(r'^[a-z]', org):  # starts with lowercase
         return False
-    if any(w in org.lower() for w in NARRATIVE_VERBS):
+    if "narrative" in keyword_features(org):
         return False
     if sum(1 for w in org.split() if w and w[0].isupper()) < 2:
         return False
@@ -116,96 +247,526 @@ def split_merged_orgs(text: str) -> List[str]:
         phrases.append(text.strip())
     return phrases
 
-def extract_indic_names(text: str) -> List[str]:
-    encoded = indic_tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-    input_ids = encoded["input_ids"].to(device)
-    attention_mask = encoded["attention_mask"].to(device)
-
-    with torch.no_grad():
-        logits = indic_model(input_ids=input_ids, attention_mask=attention_mask).logits
-
-    predictions = torch.argmax(logits, dim=2)[0]
-    tokens = indic_tokenizer.convert_ids_to_tokens(input_ids[0])
-    labels = [id2label[p.item()] for p in predictions]
-
-    people = []
+def pack_batches(lengths: List[int], batch_size: int, max_tokens: int) -> List[List[int]]:
+    """Group item indices into batches of similar length, bounded by row count and padded token budget."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
     current = []
-
-    for token, label in zip(tokens, labels):
-        token = token.replace("##", "")
-        if token in {"[CLS]", "[SEP]"}:
-            continue
-        if label.startswith("B-"):
-            if current:
-                people.append(" ".join(current))
-            current = [token]
-        elif label.startswith("I-") and current:
-            current.append(token)
-        else:
-            if current:
-                people.append(" ".join(current))
+    for i in order:
+        # Sorted ascending, so the newest item is always the longest in the batch
+        if current and (len(current) >= batch_size or lengths[i] * (len(current) + 1) > max_tokens):
+            batches.append(current)
             current = []
+        current.append(i)
     if current:
-        people.append(" ".join(current))
-
-    return [clean_entity(p) for p in people if len(p.strip()) > 2]
-
-def deduplicate_by_substring(entities: List[str]) -> List[str]:
-    entities = sorted(set(entities), key=len, reverse=True)  # longest first
-    final = []
-    for entity in entities:
-        if not any(entity != other and entity in other for other in final):
-            final.append(entity)
-    return final
-
-def extract_names(text: str) -> Tuple[List[str], List[str]]:
-    logger.info("🔍 Running hybrid NER pipeline...")
-    people_set = set()
-    orgs_set = set()
-
-    chunks = chunk_text(text)
-
-    for chunk in chunks:
-        indic_people = extract_indic_names(chunk)
-        people_set.update(p for p in indic_people if is_valid_name(p))
-
-        sent = Sentence(chunk)
-        flair_tagger.predict(sent)
+        batches.append(current)
+    return batches
+
+def label_tables(id2label: Dict[int, str]):
+    """Boolean lookup arrays over label ids: (is B-, is I-, is not O)."""
+    import numpy as np
+
+    size = max(int(i) for i in id2label) + 1
+    is_begin, is_inside, is_entity = (np.zeros(size, dtype=bool) for _ in range(3))
+    for i, label in id2label.items():
+        is_begin[int(i)] = label.startswith("B-")
+        is_inside[int(i)] = label.startswith("I-")
+        is_entity[int(i)] = label != "O"
+    return is_begin, is_inside, is_entity
+
+def decode_spans(owner, start, end, label_ids, tables):
+    """Turn labelled tokens into entity spans with array operations.
+
+    Tokens come as parallel arrays sorted by (owner, start). Returns (owner, start, end)
+    arrays, one row per entity. A token glued to the previous one (a WordPiece
+    continuation) never starts a new entity; an I- token only continues an open one.
+    """
+    import numpy as np
+
+    is_begin, is_inside, is_entity = (table[label_ids] for table in tables)
+    n = len(owner)
+    first = np.ones(n, dtype=bool)
+    first[1:] = owner[1:] != owner[:-1]
+    glued = np.zeros(n, dtype=bool)
+    glued[1:] = (start[1:] == end[:-1]) & ~first[1:]
+    continues = is_entity & (is_inside | glued)
+
+    # A token is inside an entity iff the last B- or break at or before it is a B-
+    anchor = is_begin | ~continues | first
+    last_anchor = np.maximum.accumulate(np.where(anchor, np.arange(n), 0))
+    inside = is_begin[last_anchor]
+
+    opens = inside.copy()
+    opens[1:] &= ~(inside[:-1] & continues[1:] & ~first[1:])
+    members = np.flatnonzero(inside)
+    starts = members[opens[members]]
+    # Members of one entity are contiguous, so its last member sits just before the next entity's first
+    group = np.cumsum(opens)[members]
+    ends = members[np.flatnonzero(np.diff(np.append(group, -1)) != 0)]
+    return owner[starts], start[starts], end[ends]
+
+def extract_indic_name_spans(texts: List[str], window_tokens: int = INDIC_MAX_LENGTH,
+                             stride: int = INDIC_WINDOW_STRIDE, batch_size: int = INDIC_BATCH_SIZE,
+                             max_batch_tokens: int = INDIC_MAX_BATCH_TOKENS, backend: Optional[str] = None,
+                             windowed: bool = True) -> List[List[Tuple[int, int]]]:
+    """Run IndicNER over many texts in padded batches; result i holds (start, end) entity spans of texts[i].
+
+    With ``windowed`` each text is cut into windows of ``window_tokens`` tokens sharing ``stride``
+    tokens with the next one, and a token seen in two windows keeps the label from the window
+    where it sits further from the edge. Otherwise each text is truncated to one window.
+    Entities are rebuilt from the tokenizer's offset mappings, so this needs a fast tokenizer.
+    """
+    if not texts:
+        return []
+
+    import numpy as np
+
+    indic_tokenizer, runner, id2label = models.indic(backend)
+    if not indic_tokenizer.is_fast:
+        raise ValueError("IndicNER needs a fast tokenizer for offset mappings")
+    with metrics.timer("ner.indic.tokenize"):
+        encoded = indic_tokenizer(list(texts), truncation=True, max_length=window_tokens,
+                                  stride=stride if windowed else 0, return_overflowing_tokens=windowed,
+                                  return_offsets_mapping=True)
+    all_ids = encoded["input_ids"]
+    lengths = np.array([len(ids) for ids in all_ids])
+    window_owner = np.asarray(encoded["overflow_to_sample_mapping"] if windowed else range(len(texts)))
+    window_base = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    offsets = np.concatenate([np.asarray(window, dtype=np.int64).reshape(-1, 2)
+                              for window in encoded["offset_mapping"]])
+    found = []  # per batch: (owner, start, end, distance to the nearest window edge, label id)
+
+    for batch in pack_batches(lengths.tolist(), batch_size, max_batch_tokens):
+        padded = indic_tokenizer.pad(
+            {"input_ids": [all_ids[w] for w in batch],
+             "attention_mask": [encoded["attention_mask"][w] for w in batch]},
+            return_tensors="np"
+        )
+
+        with metrics.timer("ner.indic.forward"):
+            predictions = np.asarray(runner.predict(padded["input_ids"], padded["attention_mask"]))
+
+        batch_lengths = lengths[batch]
+        rows, positions = np.nonzero(np.arange(predictions.shape[1]) < batch_lengths[:, None])
+        token_offsets = offsets[window_base[batch][rows] + positions]
+        found.append((window_owner[batch][rows], token_offsets[:, 0], token_offsets[:, 1],
+                      np.minimum(positions, batch_lengths[rows] - 1 - positions), predictions[rows, positions]))
+
+    owner, start, end, context, label_ids = (np.concatenate(column) for column in zip(*found))
+    real = start < end  # drops [CLS], [SEP]
+    owner, start, end, context, label_ids = owner[real], start[real], end[real], context[real], label_ids[real]
+
+    # A token seen in several windows keeps the label from the window where it is furthest from an edge
+    order = np.lexsort((-context, start, owner))
+    owner, start, end, label_ids = owner[order], start[order], end[order], label_ids[order]
+    keep = np.ones(len(owner), dtype=bool)
+    keep[1:] = (owner[1:] != owner[:-1]) | (start[1:] != start[:-1])
+    owner, start, end, label_ids = owner[keep], start[keep], end[keep], label_ids[keep]
+
+    results: List[List[Tuple[int, int]]] = [[] for _ in texts]
+    if len(owner):
+        entities = decode_spans(owner, start, end, label_ids, label_tables(id2label))
+        for o, s, e in zip(*(column.tolist() for column in entities)):
+            results[o].append((s, e))
+    return results
+
+def extract_indic_names_batch(texts: List[str], batch_size: int = INDIC_BATCH_SIZE,
+                              max_batch_tokens: int = INDIC_MAX_BATCH_TOKENS,
+                              backend: Optional[str] = None) -> List[List[str]]:
+    """Run IndicNER over many texts, each truncated to INDIC_MAX_LENGTH tokens; result i holds the entities of texts[i]."""
+    spans = extract_indic_name_spans(texts, batch_size=batch_size, max_batch_tokens=max_batch_tokens,
+                                     backend=backend, windowed=False)
+    return [[clean_entity(text[start:end]) for start, end in text_spans if len(text[start:end].strip()) > 2]
+            for text, text_spans in zip(texts, spans)]
 
+def extract_indic_names(text: str) -> List[str]:
+    return extract_indic_names_batch([text])[0]
+
+def _locate(text: str, phrase: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Find a whitespace-normalized phrase in text[start:end]."""
+    pattern = r"\s+".join(re.escape(word) for word in phrase.split())
+    match = re.compile(pattern).search(text, start, end) if pattern else None
+    return match.span() if match else None
+
+def _blank_sentences(text: str, sentences: List[Tuple[int, int]], live: List[int]) -> str:
+    """``text`` with every sentence not in ``live`` replaced by spaces, so offsets still hold."""
+    if len(live) == len(sentences):
+        return text
+    keep = set(live)
+    pieces = []
+    pos = 0
+    for i, (start, end) in enumerate(sentences):
+        if i not in keep:
+            pieces.append(text[pos:start])
+            pieces.append(" " * (end - start))
+            pos = end
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+def _indic_candidates(texts: List[str], mode: str, batch_size: int, max_batch_tokens: int,
+                      backend: Optional[str], live: Optional[List[List[int]]] = None) -> List[List[Span]]:
+    """IndicNER people in each text, looking only at the sentences in ``live`` (default: all)."""
+    sentences = [get_document(text).sentences for text in texts]
+    if live is None:
+        live = [list(range(len(text_sentences))) for text_sentences in sentences]
+    if mode == "windows":
+        # Skipped sentences are blanked out; texts with nothing left are not tagged at all
+        tagged = [i for i, text_live in enumerate(live) if text_live]
+        gated = [_blank_sentences(texts[i], sentences[i], live[i]) for i in tagged]
+        tagged_found = iter(extract_indic_name_spans(gated, batch_size=batch_size, max_batch_tokens=max_batch_tokens,
+                                                     backend=backend) if gated else [])
+        found = [next(tagged_found) if text_live else [] for text_live in live]
+    else:
+        # Every live sentence of every text goes through the same batched pass
+        sentences = [[text_sentences[i] for i in text_live] for text_sentences, text_live in zip(sentences, live)]
+        pieces = [text[start:end] for text, text_sentences in zip(texts, sentences) for start, end in text_sentences]
+        piece_spans = iter(extract_indic_name_spans(pieces, batch_size=batch_size, max_batch_tokens=max_batch_tokens,
+                                                    backend=backend, windowed=False))
+        found = [[(base + start, base + end) for base, _ in text_sentences for start, end in next(piece_spans)]
+                 for text_sentences in sentences]
+
+    candidates = []
+    for text, text_found in zip(texts, found):
+        text_candidates = []
+        for start, end in text_found:
+            person = clean_entity(text[start:end])
+            if len(person) > 2 and is_valid_name(person):
+                text_candidates.append(Span(start, end, "PER", "indicner", person))
+        candidates.append(text_candidates)
+    return candidates
+
+def _flair_candidates(texts: List[str], live: Optional[List[List[int]]] = None) -> List[List[Span]]:
+    """Tag the documents' shared sentence/word segmentation with Flair, in one batched predict.
+
+    Only the sentences in ``live`` (default: all) are tagged.
+    """
+    owners = []
+    sentence_words = []
+    for i, text in enumerate(texts):
+        text_words = get_document(text).sentence_words
+        for words in (text_words if live is None else (text_words[j] for j in live[i])):
+            if words:
+                owners.append(i)
+                sentence_words.append(words)
+    candidates: List[List[Span]] = [[] for _ in texts]
+    if not sentence_words:
+        return candidates
+
+    from flair.data import Sentence
+
+    sentences = [Sentence([texts[i][start:end] for start, end in words]) for i, words in zip(owners, sentence_words)]
+    tagger = models.flair()
+    with metrics.timer("ner.flair.predict"):
+        tagger.predict(sentences, mini_batch_size=FLAIR_BATCH_SIZE)
+
+    for i, sent, words in zip(owners, sentences, sentence_words):
+        text = texts[i]
         for span in sent.get_spans('ner'):
             label = span.get_label("ner").value
-            entity = clean_entity(span.text)
+            start, end = words[span.tokens[0].idx - 1][0], words[span.tokens[-1].idx - 1][1]
+            entity = clean_entity(text[start:end])
             if label == "ORG":
                 if is_probable_org(entity):
-                    split_orgs = split_merged_orgs(entity)
-                    orgs_set.update(split_orgs)
+                    for phrase in split_merged_orgs(entity):
+                        located = _locate(text, phrase, start, end)
+                        if located:
+                            candidates[i].append(Span(located[0], located[1], "ORG", "flair", phrase))
                 else:
-                    orgs_set.add(entity)
+                    candidates[i].append(Span(start, end, "ORG", "flair", entity))
             elif label == "PER" and is_valid_name(entity):
-                people_set.add(entity)
+                candidates[i].append(Span(start, end, "PER", "flair", entity))
+    return candidates
+
+def cement_like_matches(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of every CEMENT_LIKE_REGEX match, in linear time.
+
+    A match runs from a word start to the first keyword at least three characters on,
+    with no character outside the regex's class in between. If a word start has no such
+    keyword before the next stop character, no later word start before it has either.
+    """
+    matches = []
+    n = len(text)
+    pos = 0
+    while True:
+        start = CEMENT_LIKE_START_REGEX.search(text, pos)
+        if start is None:
+            return matches
+        first = start.start()
+        stop = CEMENT_LIKE_STOP_REGEX.search(text, first + 1)
+        limit = stop.start() if stop else n
+        keyword = CEMENT_LIKE_KEYWORD_REGEX.search(text, first + 3, limit)
+        if keyword:
+            matches.append((first, keyword.end()))
+            pos = keyword.end()
+        else:
+            pos = limit
 
-    for match in PRIVATE_ORG_REGEX.finditer(text):
-        orgs_set.add(clean_entity(match.group(1)))
-    for match in COMPANY_REGEX.finditer(text):
-        orgs_set.add(clean_entity(match.group(1)))
-    for match in CEMENT_LIKE_REGEX.finditer(text):
-        orgs_set.add(clean_entity(match.group(1)))
+def _regex_org_candidates(text: str) -> List[Span]:
+    candidates = []
+    for regex in (PRIVATE_ORG_REGEX, COMPANY_REGEX):
+        for match in regex.finditer(text):
+            candidates.append(Span(match.start(1), match.end(1), "ORG", "regex", clean_entity(match.group(1))))
+    for start, end in cement_like_matches(text):
+        candidates.append(Span(start, end, "ORG", "regex", clean_entity(text[start:end])))
 
-    ms_matches = []
     for match in MS_ORG_REGEX.finditer(text):
         name = clean_entity(match.group(0))
         if 2 <= len(name.split()) <= 6:
-            ms_matches.append(name)
-    orgs_set.update(ms_matches)
+            candidates.append(Span(match.start(), match.end(), "ORG", "regex", name))
+    return candidates
+
+def _finalize_names(candidates: List[Span]) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Span, ...]]:
+    people_set = {span.value for span in candidates if span.label == "PER"}
+    orgs_set = {span.value for span in candidates if span.label == "ORG"}
 
     final_people = deduplicate_by_substring([
         p for p in people_set if is_valid_name(p) and not is_location_like(p)
     ])
 
+    people_lookup = set(final_people)
     final_orgs = deduplicate_by_substring([
         o for o in orgs_set
-        if o not in final_people and len(o) > 3 and is_probable_org(o) and is_clean_org(o)
+        if o not in people_lookup and len(o) > 3 and is_probable_org(o) and is_clean_org(o)
     ])
 
-    logger.info(f"🧑 People found: {len(final_people)} | 🏢 Organizations found: {len(final_orgs)}")
-    return final_people, final_orgs
+    orgs_lookup = set(final_orgs)
+    spans = sorted(span for span in candidates
+                   if (span.value in people_lookup if span.label == "PER" else span.value in orgs_lookup))
+
+    logger.debug(f"🧑 People found: {len(final_people)} | 🏢 Organizations found: {len(final_orgs)}")
+    return tuple(final_people), tuple(final_orgs), tuple(spans)
+
+def _recall(text: str, start: int, end: int, remembered: Tuple[str, Tuple[Span, ...]]) -> List[Span]:
+    """Memoized candidates of a sentence, placed at text[start:end]."""
+    seen_chunk, spans = remembered
+    if seen_chunk == text[start:end]:
+        return [span._replace(start=start + span.start, end=start + span.end) for span in spans]
+    # Same text up to Unicode/whitespace variants: find each entity again in this copy
+    recalled = []
+    for span in spans:
+        located = _locate(text, normalize_chunk(span.value), start, end)
+        if located:
+            recalled.append(span._replace(start=located[0], end=located[1]))
+    return recalled
+
+def _sentence_runs(text: str, sentences: List[Tuple[int, int]], windowed: bool) -> List[Tuple[int, int]]:
+    """(first, last) sentence indices of the runs the gate decides on together.
+
+    Chunks mode tags every sentence on its own, so each is its own run. In windows mode a
+    name can carry on past a line wrap ("Shri Ramesh" / "Verma on behalf of ...") or a split
+    at initials ("Smt" / "R" / "Devi was present ..."), so sentences joined by a single line
+    break, or following a short piece, share a run.
+    """
+    if not windowed:
+        return [(i, i) for i in range(len(sentences))]
+    runs: List[Tuple[int, int]] = []
+    for i, (start, end) in enumerate(sentences):
+        if runs:
+            previous_start, previous_end = sentences[i - 1]
+            wrapped = not SENTENCE_END_REGEX.search(text, previous_end, start)
+            if wrapped or previous_end - previous_start < GATE_MIN_CHARS:
+                runs[-1] = (runs[-1][0], i)
+                continue
+        runs.append((i, i))
+    return runs
+
+def _gate_sentences(text: str, memo_key: tuple, claimed: set, windowed: bool):
+    """Decide, run by run (see _sentence_runs), what has to go through NER.
+
+    Returns the live sentence indices, the memo key of each live run worth remembering
+    (by its (start, end) offsets), the candidates recalled from the memo, the runs waiting
+    for a copy tagged earlier in the batch as (first, last, key) (``claimed`` holds the
+    keys already sent), and the skipped and memo-hit sentence counts.
+    """
+    sentences = get_document(text).sentences
+    live: List[int] = []
+    keys: Dict[Tuple[int, int], tuple] = {}
+    recalled: List[Span] = []
+    waiting: List[Tuple[int, int, tuple]] = []
+    skipped = hits = 0
+    for first, last in _sentence_runs(text, sentences, windowed):
+        start, end = sentences[first][0], sentences[last][1]
+        count = last - first + 1
+        if end - start < GATE_MIN_CHARS:
+            live.extend(range(first, last + 1))
+            continue
+        normalized = normalize_chunk(text[start:end])
+        if not has_name_candidates(normalized):
+            skipped += count
+            continue
+        key = memo_key + (normalized,)
+        if key in claimed:
+            hits += count
+            waiting.append((first, last, key))
+            continue
+        remembered = chunk_memo.get(key)
+        if remembered is None:
+            live.extend(range(first, last + 1))
+            keys[(start, end)] = key
+            claimed.add(key)
+            continue
+        hits += count
+        recalled.extend(_recall(text, start, end, remembered))
+    return live, keys, recalled, waiting, skipped, hits
+
+def _remember_sentences(text: str, keys: Dict[Tuple[int, int], tuple],
+                        candidates: List[Span]) -> Dict[tuple, Optional[Tuple[str, Tuple[Span, ...]]]]:
+    """Store the candidates found inside each freshly tagged run in the chunk memo.
+
+    A run touched by an entity crossing its bounds (windows mode) is not remembered: its
+    candidates depend on the text around it, so a replay would split or drop the entity.
+
+    Returns the same entries keyed by memo key (None for runs not remembered), so repeats
+    later in the batch do not depend on the LRU still holding them.
+    """
+    if not keys:
+        return {}
+    bounds = sorted(keys)
+    starts = [start for start, _ in bounds]
+    found: Dict[Tuple[int, int], List[Span]] = {run: [] for run in bounds}
+    crossed = set()
+    for span in candidates:
+        i = bisect_right(starts, span.start) - 1
+        if i >= 0 and span.end <= bounds[i][1]:
+            found[bounds[i]].append(span)
+            continue
+        for run in bounds[max(i, 0):bisect_right(starts, span.end - 1)]:
+            if run[1] > span.start:
+                crossed.add(run)
+    tagged = {}
+    for (start, end), spans in found.items():
+        key = keys[(start, end)]
+        if (start, end) in crossed:
+            tagged[key] = None
+            continue
+        relative = tuple(span._replace(start=span.start - start, end=span.end - start) for span in spans)
+        tagged[key] = (text[start:end], relative)
+        chunk_memo.put(key, tagged[key])
+    return tagged
+
+def resolve_names_batch(texts: List[str], batch_size: int = INDIC_BATCH_SIZE,
+                        max_batch_tokens: int = INDIC_MAX_BATCH_TOKENS, backend: Optional[str] = None,
+                        mode: Optional[str] = None, prefilter: Optional[bool] = None,
+                        names_mode: Optional[str] = None) -> List[Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Span, ...]]]:
+    """(people, orgs, spans) for each text, with one IndicNER pass and one Flair pass over all of them.
+
+    With the prefilter (default: NER_PREFILTER), sentences that cannot hold a name are
+    skipped and sentences tagged before are answered from the chunk memo (repeats within
+    the batch of a run that an entity crossed get a second, smaller pass). In the fast
+    names mode no model runs: people come from honorifics and the name gazetteer.
+    """
+    texts = list(texts)
+    if _check_names_mode(names_mode) == "fast":
+        with metrics.timer("ner.fast", sum(len(text) for text in texts)) as measurement:
+            results = [_finalize_names(fast_person_candidates(text) + _regex_org_candidates(text)) for text in texts]
+            measurement.entities = sum(len(spans) for _, _, spans in results)
+        return results
+
+    logger.debug("🔍 Running hybrid NER pipeline...")
+    mode = _check_mode(mode)
+    prefilter = NER_PREFILTER if prefilter is None else prefilter
+
+    if prefilter:
+        gate_start = time.perf_counter()
+        memo_key = (mode, backend or models.indic_backend)
+        claimed: set = set()
+        gates = [_gate_sentences(text, memo_key, claimed, mode == "windows") for text in texts]
+        live = [gate[0] for gate in gates]
+        gate_seconds = time.perf_counter() - gate_start
+    else:
+        live = None
+
+    indic = _indic_candidates(texts, mode, batch_size, max_batch_tokens, backend, live)
+    flair = _flair_candidates(texts, live)
+    candidates = [text_indic + text_flair for text_indic, text_flair in zip(indic, flair)]
+    if prefilter:
+        tagged = {}
+        for text, text_candidates, (_, keys, _, _, _, _) in zip(texts, candidates, gates):
+            tagged.update(_remember_sentences(text, keys, text_candidates))
+        # Repeats of a run that was not remembered (an entity crossed its bounds) are tagged in place
+        retag: List[List[int]] = [[] for _ in texts]
+        for text, text_candidates, text_retag, (_, _, recalled, waiting, _, _) in zip(texts, candidates, retag, gates):
+            text_candidates.extend(recalled)
+            sentences = get_document(text).sentences
+            for first, last, key in waiting:
+                if tagged.get(key) is None:
+                    text_retag.extend(range(first, last + 1))
+                else:
+                    text_candidates.extend(_recall(text, sentences[first][0], sentences[last][1], tagged[key]))
+        if any(retag):
+            indic = _indic_candidates(texts, mode, batch_size, max_batch_tokens, backend, retag)
+            flair = _flair_candidates(texts, retag)
+            for text_candidates, text_indic, text_flair in zip(candidates, indic, flair):
+                text_candidates.extend(text_indic + text_flair)
+
+        total = sum(len(get_document(text).sentences) for text in texts)
+        skipped = sum(gate[4] for gate in gates)
+        hits = sum(gate[5] for gate in gates) - sum(len(text_retag) for text_retag in retag)
+        prefilter_stats.add(len(texts), total, skipped, hits)
+        metrics.record("ner.prefilter", gate_seconds, 0.0, sum(len(text) for text in texts), total - skipped - hits)
+        if total:
+            logger.debug(f"🚦 NER prefilter: {skipped}/{total} sentences skipped, "
+                        f"{hits} from memo, {total - skipped - hits} to NER")
+    return [_finalize_names(text_candidates + _regex_org_candidates(text))
+            for text, text_candidates in zip(texts, candidates)]
+
+@lru_cache(maxsize=NAMES_CACHE_SIZE)
+def _resolve_names(text: str, batch_size: int, max_batch_tokens: int, backend: Optional[str],
+                   mode: str, names_mode: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Span, ...]]:
+    """Final people, final orgs and the spans carrying them, for extract_names and extract_name_spans."""
+    return resolve_names_batch([text], batch_size, max_batch_tokens, backend, mode, names_mode=names_mode)[0]
+
+def _check_mode(mode: Optional[str]) -> str:
+    mode = mode or INDIC_NER_MODE
+    if mode not in INDIC_NER_MODES:
+        raise ValueError(f"Unknown IndicNER mode: {mode} (choose from {', '.join(INDIC_NER_MODES)})")
+    return mode
+
+def _check_names_mode(names_mode: Optional[str]) -> str:
+    names_mode = names_mode or NAMES_MODE
+    if names_mode not in NAMES_MODES:
+        raise ValueError(f"Unknown names mode: {names_mode} (choose from {', '.join(NAMES_MODES)})")
+    return names_mode
+
+def set_names_mode(names_mode: str):
+    """Make ``names_mode`` the default of this process, e.g. from a --names-mode flag."""
+    global NAMES_MODE
+    NAMES_MODE = _check_names_mode(names_mode)
+
+def names_variant() -> str:
+    """Suffix for the extractor version naming every setting that changes the output.
+
+    Incremental runs must tell apart results of the fast mode, another IndicNER backend,
+    the chunks input mode or the prefilter turned off. Defaults add nothing, so results
+    stored before these settings existed stay valid.
+    """
+    if NAMES_MODE != "hybrid":
+        return NAMES_MODE
+    parts = []
+    if models.indic_backend != "torch":
+        parts.append(models.indic_backend)
+    if INDIC_NER_MODE != "windows":
+        parts.append(INDIC_NER_MODE)
+    if not NER_PREFILTER:
+        parts.append("noprefilter")
+    return "/".join(parts)
+
+def extract_name_spans(text: str, batch_size: int = INDIC_BATCH_SIZE,
+                       max_batch_tokens: int = INDIC_MAX_BATCH_TOKENS,
+                       backend: Optional[str] = None, mode: Optional[str] = None,
+                       names_mode: Optional[str] = None) -> List[Span]:
+    """Every detection of a final person (PER) or organization (ORG), in text order.
+
+    ``source`` tells which detector found it: indicner, flair or regex, and in the fast
+    names mode honorific, gazetteer or regex.
+    """
+    return list(_resolve_names(text, batch_size, max_batch_tokens, backend, _check_mode(mode),
+                               _check_names_mode(names_mode))[2])
+
+def extract_names(text: str, batch_size: int = INDIC_BATCH_SIZE,
+                  max_batch_tokens: int = INDIC_MAX_BATCH_TOKENS,
+                  backend: Optional[str] = None, mode: Optional[str] = None,
+                  names_mode: Optional[str] = None) -> Tuple[List[str], List[str]]:
+    people, orgs, _ = _resolve_names(text, batch_size, max_batch_tokens, backend, _check_mode(mode),
+                                     _check_names_mode(names_mode))
+    return list(people), list(orgs)
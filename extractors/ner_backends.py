@@ -0,0 +1,126 @@
+import os
+from typing import Any, Callable
+from extractors.logger import get_logger
+
+logger = get_logger("NERBackend")
+
+NER_BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_CACHE_DIR = os.environ.get("ONNX_CACHE_DIR", os.path.join(".cache", "onnx"))
+ONNX_OPSET = 14
+
+
+class NerBackend:
+    """Token-classification forward pass: padded input ids and attention mask in, label ids out.
+
+    ``predict`` takes int64 numpy arrays of shape (batch, sequence) and returns the argmax
+    label id of every position as a numpy array of the same shape.
+    """
+    name = "base"
+
+    def predict(self, input_ids, attention_mask):
+        raise NotImplementedError
+
+
+class TorchBackend(NerBackend):
+    """The Hugging Face PyTorch model, on GPU when there is one."""
+    name = "torch"
+
+    def __init__(self, model, device):
+        self.model = model
+        self.device = device
+
+    def predict(self, input_ids, attention_mask):
+        import torch
+
+        input_ids = torch.from_numpy(input_ids).to(self.device)
+        attention_mask = torch.from_numpy(attention_mask).to(self.device)
+        with torch.no_grad():
+            logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+        return logits.argmax(dim=-1).cpu().numpy()
+
+
+class OnnxBackend(NerBackend):
+    """An exported model run by ONNX Runtime on CPU. Needs onnxruntime."""
+    name = "onnx"
+
+    def __init__(self, model_path: str, threads: int = 0, name: str = "onnx"):
+        self.name = name
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The onnx NER backends need onnxruntime: pip install onnxruntime") from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def predict(self, input_ids, attention_mask):
+        import numpy as np
+
+        feeds = {"input_ids": input_ids.astype(np.int64), "attention_mask": attention_mask.astype(np.int64)}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+        logits = self.session.run(None, feeds)[0]
+        return logits.argmax(axis=-1)
+
+
+def onnx_model_path(model_name: str, quantized: bool, cache_dir: str = ONNX_CACHE_DIR) -> str:
+    filename = "model.int8.onnx" if quantized else "model.onnx"
+    return os.path.join(cache_dir, model_name.replace("/", "__"), filename)
+
+
+def export_onnx(model, path: str, opset: int = ONNX_OPSET):
+    """Export a token-classification model to ONNX with dynamic batch and sequence axes."""
+    import torch
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_ids, attention_mask):
+            return self.inner(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    model = model.to("cpu").eval()
+    dummy = torch.ones((1, 8), dtype=torch.long)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            LogitsOnly(model), (dummy, dummy), tmp_path,
+            input_names=["input_ids", "attention_mask"], output_names=["logits"],
+            dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": axes},
+            opset_version=opset,
+        )
+    os.replace(tmp_path, path)
+
+
+def quantize_onnx(src_path: str, dst_path: str):
+    """Dynamic int8 quantization of the weights; activations are quantized on the fly at run time."""
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise ImportError("The onnx-int8 NER backend needs onnxruntime: pip install onnxruntime") from e
+
+    tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+    quantize_dynamic(src_path, tmp_path, weight_type=QuantType.QInt8)
+    os.replace(tmp_path, dst_path)
+
+
+def load_onnx_backend(model_name: str, quantized: bool, load_torch_model: Callable[[], Any],
+                      threads: int = 0, cache_dir: str = ONNX_CACHE_DIR) -> OnnxBackend:
+    """Open the cached ONNX export of a model, exporting (and quantizing) it on first use."""
+    fp32_path = onnx_model_path(model_name, False, cache_dir)
+    path = onnx_model_path(model_name, quantized, cache_dir)
+    if not os.path.exists(path):
+        if not os.path.exists(fp32_path):
+            logger.info(f"Exporting {model_name} to ONNX: {fp32_path}")
+            export_onnx(load_torch_model(), fp32_path)
+        if quantized:
+            logger.info(f"Quantizing {model_name} to int8: {path}")
+            quantize_onnx(fp32_path, path)
+    return OnnxBackend(path, threads, "onnx-int8" if quantized else "onnx")
@@ -1,9 +1,14 @@
 import re
 from typing import Tuple, List
+from extractors.document import Span
 from extractors.logger import get_logger
+from extractors.scanner import scan_text
+from extractors.validators import validate_gstins, validate_pans
 
 logger = get_logger("PAN_GSTIN_Extractor")
 
+EXTRACTOR_VERSION = "2"
+
 # PAN Format: 5 letters + 4 digits + 1 letter
 PAN_REGEX = re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]\b')
 
@@ -11,15 +16,23 @@ PAN_REGEX = re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]\b')
 GSTIN_REGEX = re.compile(r'\b\d{2}[A-Z]{5}\d{4}[A-Z][A-Z\d]Z[A-Z\d]\b')
 
 
-def extract_pan_and_gstin(text: str) -> Tuple[List[str], List[str]]:
-    logger.info("Extracting PAN and GSTIN...")
+def extract_pan_and_gstin_spans(text: str) -> List[Span]:
+    scan = scan_text(text)
+    # Shape-only matches are checked against the state codes, PAN entity types and check character
+    gstins = validate_gstins(text, scan.gstins)
+    # Filter PANs that are part of GSTIN
+    embedded_pans = {gstin[2:12] for _, _, gstin in gstins}
+    spans = [Span(start, end, "PAN", "scanner", pan) for start, end, pan in validate_pans(scan.pans)
+             if pan not in embedded_pans]
+    spans.extend(Span(start, end, "GSTIN", "scanner", gstin) for start, end, gstin in gstins)
+    return spans
 
-    pans = set(re.findall(PAN_REGEX, text))
-    gstins = set(re.findall(GSTIN_REGEX, text))
+def extract_pan_and_gstin(text: str) -> Tuple[List[str], List[str]]:
+    logger.debug("Extracting PAN and GSTIN...")
 
-    # Filter PANs that are part of GSTIN
-    embedded_pans = {gstin[2:12] for gstin in gstins}
-    final_pans = pans - embedded_pans
+    spans = extract_pan_and_gstin_spans(text)
+    final_pans = {span.value for span in spans if span.label == "PAN"}
+    gstins = {span.value for span in spans if span.label == "GSTIN"}
 
-    logger.info(f"PANs: {len(final_pans)} | GSTINs: {len(gstins)}")
+    logger.debug(f"PANs: {len(final_pans)} | GSTINs: {len(gstins)}")
     return sorted(final_pans), sorted(gstins)
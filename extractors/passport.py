@@ -1,21 +1,29 @@
 import re
 from typing import List
+from extractors.document import Span
 from extractors.logger import get_logger
+from extractors.scanner import scan_text
+from extractors.validators import validate_passports
 
 logger = get_logger("PassportExtractor")
 
+EXTRACTOR_VERSION = "2"
+
 # Indian passport format: one letter (excluding Q, X, Z) followed by 7 digits
 PASSPORT_REGEX = re.compile(r'\b(?:Passport\s*[:\-]?\s*)?([A-PR-WYa-pr-wy][1-9]\d{6})\b')
 
 
-def extract_passport_numbers(text: str) -> List[str]:
-    logger.info("Extracting passport numbers...")
+def extract_passport_spans(text: str) -> List[Span]:
+    # Only the passport number part, normalized to uppercase; a letter and seven digits
+    # is common enough that the word passport has to be nearby
+    return [Span(start, end, "PASSPORT", "scanner", number.upper())
+            for start, end, number in validate_passports(text, scan_text(text).passports)]
 
-    # Find all matching groups (only the passport number part)
-    matches = PASSPORT_REGEX.findall(text)
+def extract_passport_numbers(text: str) -> List[str]:
+    logger.debug("Extracting passport numbers...")
 
-    # Normalize to uppercase and remove duplicates
-    unique_passports = sorted(set(m.upper() for m in matches))
+    # Remove duplicates
+    unique_passports = sorted({span.value for span in extract_passport_spans(text)})
 
-    logger.info(f"Passport numbers found: {len(unique_passports)}")
+    logger.debug(f"Passport numbers found: {len(unique_passports)}")
     return unique_passports
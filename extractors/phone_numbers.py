@@ -1,9 +1,13 @@
 import re
 from typing import List, Tuple
+from extractors.document import Span
 from extractors.logger import get_logger
+from extractors.scanner import scan_text
 
 logger = get_logger("PhoneExtractor")
 
+EXTRACTOR_VERSION = "1"
+
 # Context keywords near numbers (optional future usage)
 CONTEXT_KEYWORDS = {"mobile", "phone", "contact", "cell", "tel", "telephone", "ph", "ph."}
 
@@ -21,34 +25,19 @@ MOBILE_PATTERN = re.compile(r'^[6-9]\d{9}$')
 LANDLINE_PATTERN = re.compile(r'^(0\d{2,4}|\d{3,5})\d{5,8}$')
 
 
+def extract_phone_spans(text: str) -> List[Span]:
+    # Matching (with ; ( ) treated as spaces) and validation happen in the shared scan
+    scan = scan_text(text)
+    spans = [Span(start, end, "MOBILE", "scanner", digits) for start, end, digits in scan.mobiles]
+    spans.extend(Span(start, end, "LANDLINE", "scanner", digits) for start, end, digits in scan.landlines)
+    return spans
+
 def extract_phone_numbers(text: str) -> Tuple[List[str], List[str]]:
-    logger.info("Extracting phone numbers (mobile + landline)...")
-
-    mobile_numbers = set()
-    landline_numbers = set()
-
-    # Normalize text for better matching
-    clean_text = text.replace(";", " ").replace(")", " ").replace("(", " ")
-
-    # Extract mobile numbers
-    for match in MOBILE_REGEX.finditer(clean_text):
-        digits = None
-        if match.group(1):  # continuous 10-digit mobile
-            digits = match.group(1)
-        elif match.group(2) and match.group(3):  # split mobile (5+5)
-            digits = match.group(2) + match.group(3)
-
-        if digits and MOBILE_PATTERN.match(digits):
-            logger.debug(f"✅ Mobile found: {digits}")
-            mobile_numbers.add(digits)
-
-    # Extract landline numbers
-    for match in LANDLINE_REGEX.finditer(clean_text):
-        raw = match.group(1)
-        digits = re.sub(r'\D', '', raw)
-        if 8 <= len(digits) <= 11 and LANDLINE_PATTERN.match(digits):
-            logger.debug(f"📞 Landline found: {digits}")
-            landline_numbers.add(digits)
-
-    logger.info(f"✅ Mobiles: {len(mobile_numbers)} | 📞 Landlines: {len(landline_numbers)}")
+    logger.debug("Extracting phone numbers (mobile + landline)...")
+
+    spans = extract_phone_spans(text)
+    mobile_numbers = {span.value for span in spans if span.label == "MOBILE"}
+    landline_numbers = {span.value for span in spans if span.label == "LANDLINE"}
+
+    logger.debug(f"✅ Mobiles: {len(mobile_numbers)} | 📞 Landlines: {len(landline_numbers)}")
     return sorted(mobile_numbers), sorted(landline_numbers)
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+from extractors import acts_sections, address, bank_details, email_ids, names, pan_gstin, passport, phone_numbers
+from extractors.document import Span
+from extractors.metrics import metrics
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """One extractor of the pipeline and the DocumentResult fields it fills.
+
+    ``version`` is the owning module's EXTRACTOR_VERSION. Bump it whenever a change
+    alters that extractor's output; incremental runs then redo just that extractor on
+    files that are otherwise unchanged. ``depends`` names extractors whose output feeds
+    this one, so their version bumps invalidate it too. ``spans`` returns the same findings
+    as offset-aware Spans. ``variant``, if set, names the current setting that changes the
+    output (e.g. the names mode or NER backend) and is appended to the version.
+    """
+    name: str
+    version: str
+    fields: Tuple[str, ...]
+    run: Callable[[str], Dict[str, list]]
+    spans: Callable[[str], List[Span]]
+    depends: Tuple[str, ...] = ()
+    variant: Optional[Callable[[], str]] = None
+
+
+def _acts(text: str) -> Dict[str, list]:
+    return {"acts": acts_sections.extract_acts_sections(text)}
+
+
+def _names(text: str) -> Dict[str, list]:
+    people, orgs = names.extract_names(text)
+    return {"people": people, "orgs": orgs}
+
+
+def _phones(text: str) -> Dict[str, list]:
+    mobiles, landlines = phone_numbers.extract_phone_numbers(text)
+    return {"mobiles": mobiles, "landlines": landlines}
+
+
+def _emails(text: str) -> Dict[str, list]:
+    return {"emails": email_ids.extract_emails(text)}
+
+
+def _pan_gstin(text: str) -> Dict[str, list]:
+    pans, gstins = pan_gstin.extract_pan_and_gstin(text)
+    return {"pans": pans, "gstins": gstins}
+
+
+def _passports(text: str) -> Dict[str, list]:
+    return {"passports": passport.extract_passport_numbers(text)}
+
+
+def _bank(text: str) -> Dict[str, list]:
+    accounts, ifscs = bank_details.extract_bank_details(text)
+    return {"accounts": accounts, "ifscs": ifscs}
+
+
+def _addresses(text: str) -> Dict[str, list]:
+    return {"addresses": address.extract_all_addresses(text)}
+
+
+EXTRACTORS = (
+    Extractor("acts", acts_sections.EXTRACTOR_VERSION, ("acts",), _acts, acts_sections.extract_acts_sections_spans),
+    Extractor("names", names.EXTRACTOR_VERSION, ("people", "orgs"), _names, names.extract_name_spans,
+              variant=names.names_variant),
+    Extractor("phones", phone_numbers.EXTRACTOR_VERSION, ("mobiles", "landlines"), _phones,
+              phone_numbers.extract_phone_spans),
+    Extractor("emails", email_ids.EXTRACTOR_VERSION, ("emails",), _emails, email_ids.extract_email_spans),
+    Extractor("pan_gstin", pan_gstin.EXTRACTOR_VERSION, ("pans", "gstins"), _pan_gstin,
+              pan_gstin.extract_pan_and_gstin_spans),
+    Extractor("passports", passport.EXTRACTOR_VERSION, ("passports",), _passports, passport.extract_passport_spans),
+    # Account numbers are filtered against the mobile numbers found
+    Extractor("bank", bank_details.EXTRACTOR_VERSION, ("accounts", "ifscs"), _bank, bank_details.extract_bank_spans,
+              depends=("phones",)),
+    # A different model or prompt gives different parses; spans only locate the raw blocks
+    Extractor("addresses", f"{address.EXTRACTOR_VERSION}/{address.LLAMA_MODEL}/{address.ADDRESS_PROMPT_VERSION}",
+              ("addresses",), _addresses, address.get_address_block_spans),
+)
+
+EXTRACTORS_BY_NAME = {extractor.name: extractor for extractor in EXTRACTORS}
+
+
+def _versioned(extractor: Extractor) -> str:
+    variant = extractor.variant() if extractor.variant else ""
+    return f"{extractor.version}/{variant}" if variant else extractor.version
+
+
+def extractor_versions() -> Dict[str, str]:
+    """Effective version of every extractor, including the versions of what it depends on."""
+    versions = {}
+    for extractor in EXTRACTORS:
+        version = _versioned(extractor)
+        for dependency in extractor.depends:
+            version += f"+{dependency}:{_versioned(EXTRACTORS_BY_NAME[dependency])}"
+        versions[extractor.name] = version
+    return versions
+
+
+def stale_extractors(recorded_versions: Dict[str, str]) -> List[str]:
+    """Names of extractors whose version differs from the recorded one."""
+    return [name for name, version in extractor_versions().items() if recorded_versions.get(name) != version]
+
+
+def extract_text(text: str, only: Optional[Collection[str]] = None, with_addresses: bool = True) -> dict:
+    """Run the extractors (all, or just those named in ``only``) over a text.
+
+    Keys are DocumentResult fields; fields of extractors that did not run are absent.
+    Each extractor run is timed in the process-wide metrics as ``extract.<name>``.
+    """
+    results = {}
+    nbytes = len(text.encode("utf-8"))
+    for extractor in EXTRACTORS:
+        if only is not None and extractor.name not in only:
+            continue
+        if extractor.name == "addresses" and not with_addresses:
+            continue
+        with metrics.timer(f"extract.{extractor.name}", nbytes) as measurement:
+            found = extractor.run(text)
+            measurement.entities = sum(len(values) for values in found.values())
+        results.update(found)
+    return results
+
+
+def extract_spans_by_extractor(text: str, only: Optional[Collection[str]] = None) -> Dict[str, List[Span]]:
+    """Spans from the extractors (all, or just those named in ``only``), keyed by extractor name."""
+    return {extractor.name: extractor.spans(text) for extractor in EXTRACTORS
+            if only is None or extractor.name in only}
+
+
+def extract_spans(text: str, only: Optional[Collection[str]] = None) -> List[Span]:
+    """Spans from the extractors (all, or just those named in ``only``), sorted by position.
+
+    Offsets index into ``text``, so redaction or highlighting is one pass over the text.
+    """
+    spans = [span for found in extract_spans_by_extractor(text, only).values() for span in found]
+    spans.sort()
+    return spans
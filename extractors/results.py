@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field, asdict, fields
+from typing import Any, Dict, List
+
+# Entity list fields of a DocumentResult, in report order
+ENTITY_FIELDS = (
+    "acts", "people", "orgs", "mobiles", "landlines", "emails",
+    "pans", "gstins", "passports", "accounts", "ifscs",
+)
+
+
+@dataclass
+class DocumentResult:
+    """Everything extracted from one document."""
+    file: str
+    acts: List[str] = field(default_factory=list)
+    people: List[str] = field(default_factory=list)
+    orgs: List[str] = field(default_factory=list)
+    mobiles: List[str] = field(default_factory=list)
+    landlines: List[str] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    pans: List[str] = field(default_factory=list)
+    gstins: List[str] = field(default_factory=list)
+    passports: List[str] = field(default_factory=list)
+    accounts: List[str] = field(default_factory=list)
+    ifscs: List[str] = field(default_factory=list)
+    # Each entry: {"raw_block": str, "components": {ADDRESS_FIELDS key: str}}
+    addresses: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DocumentResult":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
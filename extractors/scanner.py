@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Tuple
+from extractors.metrics import metrics
+
+# One walk over the text visits every place a pattern-based identifier can occur:
+#   - "Section"/"Sec" keywords, where act citations start
+#   - "@" signs, around which e-mail addresses sit
+#   - words containing a digit: PAN, GSTIN, IFSC, account, passport and phone numbers
+# Each hit is then handed to the per-type extractor regexes, anchored at that spot.
+MASTER_REGEX = re.compile(
+    r"(?P<section>(?i:\b(?:section|sec)\s))"
+    r"|(?P<word>\b(?P<lead>[^\W\d]*)\d\w*)"
+    r"|(?P<at>@)"
+)
+
+DIGIT_REGEX = re.compile(r"\d")
+
+# Characters a phone match can span; the phone extractor treats ; ( ) as spaces
+PHONE_RUN_REGEX = re.compile(r"[\d\s\-()+;]*")
+PHONE_CLEAN_TABLE = str.maketrans({";": " ", "(": " ", ")": " "})
+
+# Characters an e-mail match can span
+EMAIL_RUN_REGEX = re.compile(r"[a-zA-Z0-9._%+\-@]*", re.IGNORECASE)
+EMAIL_CHAR_REGEX = re.compile(r"[a-zA-Z0-9._%+\-@]", re.IGNORECASE)
+
+
+# One raw match: (start, end, value); value is the regex groups for acts, a string otherwise
+Match = Tuple[int, int, Any]
+
+
+class ScanResult(NamedTuple):
+    """Raw matches of every pattern-based extractor, in text order."""
+    acts: Tuple[Match, ...]
+    pans: Tuple[Match, ...]
+    gstins: Tuple[Match, ...]
+    ifscs: Tuple[Match, ...]
+    accounts: Tuple[Match, ...]
+    passports: Tuple[Match, ...]
+    emails: Tuple[Match, ...]
+    mobiles: Tuple[Match, ...]
+    landlines: Tuple[Match, ...]
+
+
+@lru_cache(maxsize=None)
+def _patterns():
+    # Imported lazily: the extractor modules own their patterns and import this module
+    from extractors.acts_sections import SECTION_PATTERN
+    from extractors.bank_details import ACCOUNT_REGEX, IFSC_REGEX
+    from extractors.email_ids import EMAIL_REGEX
+    from extractors.pan_gstin import GSTIN_REGEX, PAN_REGEX
+    from extractors.passport import PASSPORT_REGEX
+    from extractors.phone_numbers import LANDLINE_PATTERN, LANDLINE_REGEX, MOBILE_PATTERN, MOBILE_REGEX
+
+    return (SECTION_PATTERN, PAN_REGEX, GSTIN_REGEX, IFSC_REGEX, ACCOUNT_REGEX, PASSPORT_REGEX,
+            EMAIL_REGEX, MOBILE_REGEX, MOBILE_PATTERN, LANDLINE_REGEX, LANDLINE_PATTERN)
+
+
+def _email_run_start(text: str, at: int) -> int:
+    start = at
+    while start > 0:
+        if not EMAIL_CHAR_REGEX.match(text[start - 1]):
+            break
+        start -= 1
+    return start
+
+
+@lru_cache(maxsize=4)
+def scan_text(text: str) -> ScanResult:
+    """Find every pattern-based identifier in a single pass over ``text``.
+
+    Results match running each extractor's own regex over the whole text. The last few
+    texts are memoized, so the ``extract_*`` views can each call this on the same string
+    and only the first call pays for the scan.
+    """
+    with metrics.timer("scan.patterns", len(text)) as measurement:
+        result = _scan(text)
+        measurement.entities = sum(len(matches) for matches in result)
+    return result
+
+
+def _scan(text: str) -> ScanResult:
+    (section_re, pan_re, gstin_re, ifsc_re, account_re, passport_re,
+     email_re, mobile_re, mobile_pattern, landline_re, landline_pattern) = _patterns()
+
+    acts: List[Match] = []
+    pans: List[Match] = []
+    gstins: List[Match] = []
+    ifscs: List[Match] = []
+    accounts: List[Match] = []
+    passports: List[Match] = []
+    emails: List[Match] = []
+    mobiles: List[Match] = []
+    landlines: List[Match] = []
+
+    acts_end = email_end = phone_end = 0
+    text_len = len(text)
+
+    for m in MASTER_REGEX.finditer(text):
+        kind = m.lastgroup
+        if kind == "section":
+            start = m.start()
+            if start < acts_end:
+                continue
+            act = section_re.match(text, start)
+            if act:
+                acts.append((start, act.end(), act.groups()))
+                acts_end = act.end()
+
+        elif kind == "at":
+            at = m.start()
+            if at < email_end:
+                continue
+            start = _email_run_start(text, at)
+            email_end = EMAIL_RUN_REGEX.match(text, at).end()
+            emails.extend((email.start(), email.end(), email.group(0))
+                          for email in email_re.finditer(text, start, min(email_end + 1, text_len)))
+
+        else:
+            # Identifier regexes are \b-delimited and made of word characters, so they can
+            # only ever match a whole word
+            token = m.group(0)
+            word_start, word_end = m.span()
+            if pan_re.fullmatch(token):
+                pans.append((word_start, word_end, token))
+            if gstin_re.fullmatch(token):
+                gstins.append((word_start, word_end, token))
+            if ifsc_re.fullmatch(token):
+                ifscs.append((word_start, word_end, token))
+            if account_re.fullmatch(token):
+                accounts.append((word_start, word_end, token))
+            passport = passport_re.fullmatch(token)
+            if passport:
+                passports.append((word_start + passport.start(1), word_start + passport.end(1), passport.group(1)))
+
+            # Phone numbers can span several words, so scan the whole run of phone-like
+            # characters starting at each digit not already covered
+            pos = m.end("lead")
+            while True:
+                digit = DIGIT_REGEX.search(text, max(pos, phone_end), word_end)
+                if not digit:
+                    break
+                pos = digit.start()
+                phone_end = PHONE_RUN_REGEX.match(text, pos).end()
+
+                # Keep one character of context each side so \b behaves as in the full text
+                lo = pos - 1 if pos > 0 else 0
+                chunk = text[lo:phone_end + 1].translate(PHONE_CLEAN_TABLE)
+                for mobile in mobile_re.finditer(chunk, pos - lo):
+                    if mobile.group(1):
+                        digits = mobile.group(1)
+                        span = mobile.span(1)
+                    elif mobile.group(2) and mobile.group(3):
+                        digits = mobile.group(2) + mobile.group(3)
+                        span = (mobile.start(2), mobile.end(3))
+                    else:
+                        continue
+                    if mobile_pattern.match(digits):
+                        mobiles.append((lo + span[0], lo + span[1], digits))
+                for landline in landline_re.finditer(chunk, pos - lo):
+                    digits = re.sub(r'\D', '', landline.group(1))
+                    if 8 <= len(digits) <= 11 and landline_pattern.match(digits):
+                        landlines.append((lo + landline.start(1), lo + landline.end(1), digits))
+
+    return ScanResult(tuple(acts), tuple(pans), tuple(gstins), tuple(ifscs), tuple(accounts),
+                      tuple(passports), tuple(emails), tuple(mobiles), tuple(landlines))
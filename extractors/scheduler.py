@@ -0,0 +1,176 @@
+"""Staged pipeline: documents flow through a chain of stages joined by bounded queues.
+
+Every stage has its own pool of worker threads and, optionally, gathers several jobs into
+one call (for batched NER). All stages work at once on different documents, so CPU-bound
+regex work, model inference and LLM round trips overlap instead of taking turns. A full
+queue blocks the stage feeding it, so memory stays bounded by the queue sizes.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from extractors.logger import get_logger
+from extractors.metrics import metrics
+
+logger = get_logger("Scheduler")
+
+STAGE_QUEUE_SIZE = 8
+
+_DONE = object()
+
+
+class Job:
+    """One document on its way through the stages; each stage fills in part of it."""
+
+    __slots__ = ("item", "text", "nbytes", "fields", "spans", "result", "error", "skip")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.text: Optional[str] = None
+        self.nbytes = 0
+        self.fields: Dict[str, list] = {}
+        self.spans: Dict[str, list] = {}
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.skip = False  # set once no later stage has anything to do for this job
+
+    @property
+    def live(self) -> bool:
+        return self.error is None and not self.skip
+
+
+class Stage:
+    """A named step run by ``workers`` threads.
+
+    ``fn`` receives a list of live jobs (up to ``batch_size``; a batch closes early once
+    ``max_wait`` seconds pass after its first job) and updates them in place. If it
+    raises, the error is recorded on every job of the batch and later stages skip them.
+    """
+
+    def __init__(self, name: str, fn: Callable[[List[Job]], None], workers: int = 1,
+                 batch_size: int = 1, max_wait: float = 0.0):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.items = 0
+        self.busy = 0.0
+        self.blocked = 0.0  # time spent waiting for room in the next queue
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, items: int, busy: float, blocked: float, start: float, end: float):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.blocked += blocked
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def throughput(self) -> float:
+        """Jobs per second over the time this stage was active."""
+        if not self.items or self.last_end is None or self.last_end <= self.first_start:
+            return 0.0
+        return self.items / (self.last_end - self.first_start)
+
+
+class StagedPipeline:
+    """Runs items through ``stages`` in order and yields finished Jobs in completion order."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = STAGE_QUEUE_SIZE):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.completed = 0
+
+    def run(self, items: Iterable[Any]) -> Iterator[Job]:
+        self.started = time.perf_counter()
+        threads = [threading.Thread(target=self._feed, args=(items,), name="stage-feed", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                threads.append(threading.Thread(target=self._work, args=(stage, i, remaining),
+                                                name=f"stage-{stage.name}-{n}", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        out = self.queues[-1]
+        while True:
+            job = out.get()
+            if job is _DONE:
+                break
+            self.completed += 1
+            yield job
+        self.finished = time.perf_counter()
+
+    def _feed(self, items: Iterable[Any]):
+        first = self.queues[0]
+        try:
+            for item in items:
+                first.put(Job(item))
+        finally:
+            first.put(_DONE)
+
+    def _next_batch(self, stage: Stage, inbox: "queue.Queue") -> Optional[List[Job]]:
+        first = inbox.get()
+        if first is _DONE:
+            inbox.put(_DONE)  # let the other workers of this stage see it too
+            return None
+        batch = [first]
+        deadline = time.monotonic() + stage.max_wait
+        while len(batch) < stage.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                job = inbox.get(timeout=remaining) if remaining > 0 else inbox.get_nowait()
+            except queue.Empty:
+                break
+            if job is _DONE:
+                inbox.put(_DONE)
+                break
+            batch.append(job)
+        return batch
+
+    def _work(self, stage: Stage, index: int, remaining: List[int]):
+        inbox, outbox = self.queues[index], self.queues[index + 1]
+        while True:
+            batch = self._next_batch(stage, inbox)
+            if batch is None:
+                break
+            live = [job for job in batch if job.live]
+            start = time.perf_counter()
+            if live:
+                try:
+                    stage.fn(live)
+                except Exception as e:
+                    logger.error(f"Stage {stage.name} failed on {len(live)} documents: {e}")
+                    for job in live:
+                        job.error = e
+            end = time.perf_counter()
+            if live:
+                metrics.record(f"stage.{stage.name}", end - start, 0.0, sum(job.nbytes for job in live), len(live))
+            for job in batch:
+                outbox.put(job)
+            stage.add(len(live), end - start, time.perf_counter() - end, start, end)
+
+        with stage._lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            outbox.put(_DONE)
+
+    def summary_table(self) -> str:
+        """Per-stage throughput: jobs/s while active, worker utilisation and time blocked downstream."""
+        wall = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        header = f"{'stage':<14}{'workers':>8}{'jobs':>8}{'busy s':>10}{'jobs/s':>10}{'util %':>8}{'blocked s':>11}"
+        lines = [header, "-" * len(header)]
+        for stage in self.stages:
+            utilisation = 100 * stage.busy / (stage.workers * wall) if wall > 0 else 0.0
+            lines.append(f"{stage.name:<14}{stage.workers:>8}{stage.items:>8}{stage.busy:>10.2f}"
+                         f"{stage.throughput():>10.2f}{utilisation:>8.0f}{stage.blocked:>11.2f}")
+        lines.append("-" * len(header))
+        lines.append(f"{'end-to-end':<14}{'':>8}{self.completed:>8}{wall:>10.2f}"
+                     f"{(self.completed / wall if wall > 0 else 0.0):>10.2f}")
+        return "\n".join(lines)
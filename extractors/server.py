@@ -0,0 +1,295 @@
+"""Long-running extraction service that keeps the NER models warm.
+
+    python -m extractors.server --port 8765
+    python -m extractors.server --unix-socket /tmp/extraction.sock
+
+    POST /extract  {"text": "...", "file": "name", "only": ["names", "phones"], "spans": true}
+    GET  /health   model and queue status
+    GET  /metrics  per-stage timings since start
+
+Names from concurrent requests are gathered into micro-batches, so IndicNER and Flair see
+one padded batch instead of one document at a time. The other extractors run in the request
+threads. When the NER queue or the request limit is full the server answers 503 with a
+Retry-After header instead of queueing without bound.
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Collection, List, Optional
+from extractors import names
+from extractors.logger import get_logger
+from extractors.metrics import metrics
+from extractors.models import models
+from extractors.ner_backends import NER_BACKENDS
+from extractors.pipeline import EXTRACTORS_BY_NAME, extract_spans, extract_text
+from extractors.results import DocumentResult
+
+logger = get_logger("Server")
+
+DEFAULT_PORT = 8765
+MAX_BATCH_SIZE = 16        # documents per NER batch
+MAX_WAIT_MS = 20           # how long the first document of a batch waits for company
+MAX_PENDING = 64           # documents queued for NER before new ones are refused
+MAX_REQUESTS = 128         # requests handled at once before new ones are refused
+MAX_BODY_BYTES = 64 * 1024 * 1024
+REQUEST_TIMEOUT = 600      # seconds a request waits for its NER result
+RETRY_AFTER_SECONDS = 1
+LISTEN_BACKLOG = 256       # connections the OS queues before the accept loop takes them
+
+
+class ServerBusy(Exception):
+    """Raised when the service is at capacity; the client should retry later."""
+
+
+class MicroBatcher:
+    """Runs items submitted from many threads through ``fn`` in batches on one worker thread.
+
+    A batch closes when it holds ``max_batch_size`` items or ``max_wait`` seconds after its
+    first item arrived, whichever comes first. At most ``max_pending`` items wait at once;
+    ``submit`` raises ServerBusy beyond that.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait: float = MAX_WAIT_MS / 1000, max_pending: int = MAX_PENDING):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.batches = 0
+        self.items = 0
+        self._thread = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        try:
+            self.queue.put_nowait((item, future))
+        except queue.Full:
+            raise ServerBusy("NER queue is full")
+        return future
+
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self) -> Optional[list]:
+        first = self.queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                self.queue.put(None)  # finish this batch, then stop
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            items = [item for item, _ in batch]
+            try:
+                with metrics.timer("server.ner_batch") as measurement:
+                    results = self.fn(items)
+                    measurement.entities = len(items)
+            except Exception as e:
+                logger.error(f"NER batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class ExtractionService:
+    """Request-independent state: the warm models, the NER batcher and the request limit."""
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS,
+                 max_pending: int = MAX_PENDING, max_requests: int = MAX_REQUESTS):
+        self.batcher = MicroBatcher(names.resolve_names_batch, max_batch_size, max_wait_ms / 1000, max_pending)
+        self.requests = threading.BoundedSemaphore(max_requests)
+        self.started = time.time()
+
+    def extract(self, text: str, file: str = "<request>", only: Optional[Collection[str]] = None,
+                with_spans: bool = False) -> dict:
+        if not self.requests.acquire(blocking=False):
+            raise ServerBusy("Too many requests in flight")
+        try:
+            if only is not None and (isinstance(only, str) or not isinstance(only, Collection)
+                                     or not all(isinstance(name, str) for name in only)):
+                raise ValueError("only must be a list of extractor names")
+            selected = set(only) if only else set(EXTRACTORS_BY_NAME)
+            unknown = selected - set(EXTRACTORS_BY_NAME)
+            if unknown:
+                raise ValueError(f"Unknown extractors: {', '.join(sorted(unknown))}")
+
+            # Queue the NER work first so it overlaps with the other extractors
+            future = self.batcher.submit(text) if "names" in selected else None
+            others = selected - {"names"}
+            fields = extract_text(text, only=others)
+            spans = extract_spans(text, only=others) if with_spans else []
+            if future is not None:
+                people, orgs, name_spans = future.result(timeout=REQUEST_TIMEOUT)
+                fields.update(people=list(people), orgs=list(orgs))
+                spans = sorted(spans + list(name_spans)) if with_spans else spans
+
+            response = DocumentResult(file=file, **fields).to_dict()
+            if with_spans:
+                response["spans"] = [span._asdict() for span in spans]
+            return response
+        finally:
+            self.requests.release()
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1),
+            "models_loaded": [name for name in ("indic." + models.indic_backend, "flair") if models.is_loaded(name)],
+            "ner_pending": self.batcher.pending(),
+            "ner_batches": self.batcher.batches,
+            "ner_documents": self.batcher.items,
+            "ner_prefilter": names.prefilter_stats.snapshot(),
+        }
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    service: ExtractionService = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        elif self.path == "/metrics":
+            self._send(200, {"stages": metrics.stage_stats()})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._send(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+            self.close_connection = True
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("body must be a JSON object")
+            text = request["text"]
+            if not isinstance(text, str):
+                raise ValueError("text must be a string")
+            response = self.service.extract(text, request.get("file", "<request>"), request.get("only"),
+                                            bool(request.get("spans")))
+        except ServerBusy as e:
+            self._send(503, {"error": str(e)}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": f"bad request: {e}"})
+        except Exception as e:
+            logger.error(f"Extraction failed: {e}")
+            self._send(500, {"error": str(e)})
+        else:
+            self._send(200, response)
+
+    def _send(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ExtractionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+
+def make_server(service: ExtractionService, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                unix_socket: Optional[str] = None):
+    handler = type("Handler", (ExtractionHandler,), {"service": service})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+    return ExtractionHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve entity extraction over HTTP with warm models.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix-socket", default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE, help="Documents per NER batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS,
+                        help="Longest a document waits for others to join its NER batch")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="Documents queued for NER before requests get 503")
+    parser.add_argument("--max-requests", type=int, default=MAX_REQUESTS,
+                        help="Requests handled at once before new ones get 503")
+    parser.add_argument("--ner-backend", choices=NER_BACKENDS, default=None)
+    parser.add_argument("--names-mode", choices=names.NAMES_MODES, default=None,
+                        help="fast skips the NER models (default: $NAMES_MODE or hybrid)")
+    parser.add_argument("--no-preload", action="store_true", help="Load the NER models on first request")
+    args = parser.parse_args(argv)
+
+    if args.ner_backend:
+        models.configure(indic_backend=args.ner_backend)
+    if args.names_mode:
+        names.set_names_mode(args.names_mode)
+    if not args.no_preload and names.NAMES_MODE != "fast":
+        logger.info("🔥 Loading NER models...")
+        models.load_all()
+
+    service = ExtractionService(args.max_batch_size, args.max_wait_ms, args.max_pending, args.max_requests)
+    server = make_server(service, args.host, args.port, args.unix_socket)
+    where = args.unix_socket or f"http://{args.host}:{server.server_address[1]}"
+    logger.info(f"🚀 Extraction service listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.batcher.close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import csv
+import json
+import sys
+from typing import List, Optional
+from extractors.results import DocumentResult, ENTITY_FIELDS
+
+OUTPUT_FORMATS = ("text", "jsonl", "csv", "parquet")
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+PARQUET_ROW_GROUP = 10_000
+
+# Separator for entity lists flattened into one CSV cell
+CSV_LIST_SEPARATOR = " | "
+
+
+class ResultSink:
+    """Buffered writer for DocumentResult records; use as a context manager."""
+
+    def write(self, result: DocumentResult):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_text(path: str):
+    if path == "-":
+        return sys.stdout, False
+    return open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_BYTES), True
+
+
+class JsonlSink(ResultSink):
+    """One JSON object per document per line."""
+
+    def __init__(self, path: str = "-"):
+        self.file, self._owns_file = _open_text(path)
+
+    def write(self, result: DocumentResult):
+        self.file.write(json.dumps(result.to_dict(), ensure_ascii=False))
+        self.file.write("\n")
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class CsvSink(ResultSink):
+    """One row per document; entity lists are joined into one cell, addresses stored as JSON."""
+
+    columns = ("file",) + ENTITY_FIELDS + ("addresses",)
+
+    def __init__(self, path: str = "-"):
+        self.file, self._owns_file = _open_text(path)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write(self, result: DocumentResult):
+        row = [result.file]
+        row.extend(CSV_LIST_SEPARATOR.join(getattr(result, name)) for name in ENTITY_FIELDS)
+        row.append(json.dumps(result.addresses, ensure_ascii=False))
+        self.writer.writerow(row)
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class ParquetSink(ResultSink):
+    """Typed Parquet output, written in row groups of ``row_group_size`` documents. Needs pyarrow."""
+
+    def __init__(self, path: str, row_group_size: int = PARQUET_ROW_GROUP):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+        from extractors.address import ADDRESS_FIELDS
+
+        self.pa = pa
+        self.address_fields = ADDRESS_FIELDS
+        components = pa.struct([(key, pa.string()) for key in ADDRESS_FIELDS])
+        self.schema = pa.schema(
+            [("file", pa.string())]
+            + [(name, pa.list_(pa.string())) for name in ENTITY_FIELDS]
+            + [("addresses", pa.list_(pa.struct([("raw_block", pa.string()), ("components", components)])))]
+        )
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.row_group_size = row_group_size
+        self.rows: List[dict] = []
+
+    def write(self, result: DocumentResult):
+        row = result.to_dict()
+        row["addresses"] = [
+            {"raw_block": a["raw_block"],
+             "components": {k: str(a["components"].get(k, "-")) for k in self.address_fields}}
+            for a in result.addresses
+        ]
+        self.rows.append(row)
+        if len(self.rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def open_sink(fmt: str, path: Optional[str] = None) -> ResultSink:
+    """Create the sink for an output format other than "text"."""
+    if fmt == "jsonl":
+        return JsonlSink(path or "-")
+    if fmt == "csv":
+        return CsvSink(path or "-")
+    if fmt == "parquet":
+        if not path or path == "-":
+            raise ValueError("Parquet output needs a file path (--output)")
+        return ParquetSink(path)
+    raise ValueError(f"Unknown output format: {fmt}")
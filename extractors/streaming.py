@@ -0,0 +1,69 @@
+import re
+from typing import Iterator, NamedTuple
+
+DEFAULT_WINDOW_CHARS = 16 * 1024 * 1024
+DEFAULT_OVERLAP_CHARS = 64 * 1024
+
+WHITESPACE_REGEX = re.compile(r"\s")
+
+
+class Window(NamedTuple):
+    text: str
+    overlap: int  # leading characters already seen at the end of the previous window
+
+    @property
+    def new_text(self) -> str:
+        return self.text[self.overlap:]
+
+
+def _cut_point(buffer: str) -> int:
+    """End the window after the last newline, else the last whitespace, else hard-cut."""
+    cut = buffer.rfind("\n") + 1
+    if cut:
+        return cut
+    for match in WHITESPACE_REGEX.finditer(buffer, max(0, len(buffer) - 4096)):
+        cut = match.end()
+    return cut or len(buffer)
+
+
+def _overlap_tail(window: str, overlap_chars: int) -> str:
+    """Last ~overlap_chars of a window, started at a line (or at least word) boundary."""
+    if overlap_chars <= 0:
+        return ""
+    start = max(0, len(window) - overlap_chars)
+    newline = window.find("\n", start)
+    if newline != -1:
+        return window[newline + 1:]
+    space = WHITESPACE_REGEX.search(window, start)
+    return window[space.end():] if space else window[start:]
+
+
+def iter_windows(path: str, window_chars: int = DEFAULT_WINDOW_CHARS,
+                 overlap_chars: int = DEFAULT_OVERLAP_CHARS) -> Iterator[Window]:
+    """Read a text file as overlapping windows of about ``window_chars`` characters.
+
+    Windows end on line boundaries where possible, and each one repeats the last
+    ``overlap_chars`` of its predecessor so matches crossing a boundary are seen whole.
+    At most one window plus one read buffer is held in memory at a time.
+    """
+    if overlap_chars * 2 > window_chars:
+        raise ValueError("overlap_chars must be at most half of window_chars")
+
+    with open(path, "r", encoding="utf-8") as f:
+        overlap = ""
+        pending = ""
+        eof = False
+        while True:
+            need = window_chars - len(overlap) - len(pending)
+            if not eof and need > 0:
+                data = f.read(need)
+                eof = not data
+                pending += data
+            if not pending:
+                break
+
+            cut = len(pending) if eof else _cut_point(pending)
+            window = overlap + pending[:cut]
+            pending = pending[cut:]
+            yield Window(window, len(overlap))
+            overlap = _overlap_tail(window, overlap_chars)
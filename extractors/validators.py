@@ -0,0 +1,121 @@
+import re
+import string
+from typing import Iterable, List, Optional, Sequence
+from extractors.phone_numbers import CONTEXT_KEYWORDS as PHONE_CONTEXT_KEYWORDS
+from extractors.scanner import Match
+
+# Characters looked at around a match for context keywords
+CONTEXT_BEFORE = 48
+CONTEXT_AFTER = 16
+
+GSTIN_CHARS = string.digits + string.ascii_uppercase
+GSTIN_CHAR_VALUES = {ch: i for i, ch in enumerate(GSTIN_CHARS)}
+# Weight-2 positions of the mod-36 checksum, with the product already folded (p // 36 + p % 36)
+GSTIN_DOUBLED = {ch: (2 * i) // 36 + (2 * i) % 36 for ch, i in GSTIN_CHAR_VALUES.items()}
+
+# GST state codes: 01-38, 97 (other territory) and 99 (centre jurisdiction)
+GSTIN_STATE_CODES = frozenset([f"{code:02d}" for code in range(1, 39)] + ["97", "99"])
+
+# Fourth PAN character: Association, Body of individuals, Company, Firm, Government,
+# HUF, Artificial juridical person, Local authority, individual Person, Trust
+PAN_ENTITY_TYPES = frozenset("ABCFGHJLPT")
+
+# First four IFSC characters of banks seen in practice; other codes need an IFSC/bank keyword nearby
+IFSC_BANK_CODES = frozenset((
+    "ABHY", "AIRP", "ALLA", "ANDB", "APGB", "AUBL", "BARB", "BDBL", "BKDN", "BKID", "BOFA", "CBIN",
+    "CITI", "CIUB", "CNRB", "CORP", "COSB", "CSBK", "DBSS", "DCBL", "DENA", "DEUT", "DLXB", "ESFB",
+    "ESMF", "FDRL", "FINO", "HDFC", "HPSC", "HSBC", "IBKL", "ICIC", "IDFB", "IDIB", "INDB", "IOBA",
+    "JAKA", "JSFB", "KARB", "KKBK", "KSCB", "KVBL", "KVGB", "LAVB", "MAHB", "NESF", "NKGS", "NTBL",
+    "ORBC", "PKGB", "PSIB", "PUNB", "PYTM", "RATN", "RBIS", "SBIN", "SCBL", "SIBL", "SURY", "SVCB",
+    "SYNB", "TMBL", "UBIN", "UCBA", "UJVN", "UTIB", "UTKS", "VIJB", "YESB",
+))
+
+CONTEXT_KEYWORDS = {
+    "GSTIN": ("gstin", "gst", "gst no", "goods and services tax"),
+    "IFSC": ("ifsc", "bank", "branch"),
+    "ACCOUNT": ("a/c", "account", "acct", "ac no", "bank", "savings", "current", "sb", "ifsc"),
+    "PASSPORT": ("passport",),
+}
+
+
+def _keyword_regex(words: Iterable[str]) -> "re.Pattern":
+    alternation = "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+CONTEXT_REGEXES = {label: _keyword_regex(words) for label, words in CONTEXT_KEYWORDS.items()}
+PHONE_CONTEXT_REGEX = _keyword_regex(word.rstrip(".") for word in PHONE_CONTEXT_KEYWORDS)
+
+
+def context_distances(text: str, matches: Sequence[Match], keyword_regex: "re.Pattern",
+                      after: int = CONTEXT_AFTER) -> List[Optional[int]]:
+    """For each match, how many characters separate it from the nearest keyword in its
+    context window (``after`` characters past its end), or None when there is none."""
+    n = len(text)
+    finditer = keyword_regex.finditer
+    distances = []
+    for start, end, _ in matches:
+        nearest = None
+        for keyword in finditer(text, max(0, start - CONTEXT_BEFORE), min(n, end + after)):
+            gap = start - keyword.end() if keyword.end() <= start else max(0, keyword.start() - end)
+            if nearest is None or gap < nearest:
+                nearest = gap
+        distances.append(nearest)
+    return distances
+
+
+def context_hits(text: str, matches: Sequence[Match], keyword_regex: "re.Pattern") -> List[bool]:
+    """For each match, whether a keyword occurs within the context window around it."""
+    n = len(text)
+    search = keyword_regex.search
+    return [search(text, max(0, start - CONTEXT_BEFORE), min(n, end + CONTEXT_AFTER)) is not None
+            for start, end, _ in matches]
+
+
+def gstin_checksum_ok(gstin: str) -> bool:
+    values, doubled = GSTIN_CHAR_VALUES, GSTIN_DOUBLED
+    total = 0
+    for i in range(0, 14, 2):
+        total += values[gstin[i]] + doubled[gstin[i + 1]]
+    return GSTIN_CHARS[-total % 36] == gstin[14]
+
+
+def validate_pans(matches: Sequence[Match]) -> List[Match]:
+    """PANs whose fourth character is a known entity type."""
+    return [m for m in matches if m[2][3] in PAN_ENTITY_TYPES]
+
+
+def validate_gstins(text: str, matches: Sequence[Match]) -> List[Match]:
+    """GSTINs with a real state code and an embedded PAN of a known entity type, whose
+    check character is right or that sit next to a GST keyword."""
+    shaped = [m for m in matches if m[2][:2] in GSTIN_STATE_CODES and m[2][5] in PAN_ENTITY_TYPES]
+    failed = [m for m in shaped if not gstin_checksum_ok(m[2])]
+    if not failed:
+        return shaped
+    vouched = {m for m, hit in zip(failed, context_hits(text, failed, CONTEXT_REGEXES["GSTIN"])) if hit}
+    return [m for m in shaped if m in vouched or gstin_checksum_ok(m[2])]
+
+
+def validate_ifscs(text: str, matches: Sequence[Match]) -> List[Match]:
+    """IFSCs of a known bank, or of an unknown one with an IFSC/bank keyword nearby."""
+    unknown = [m for m in matches if m[2][:4] not in IFSC_BANK_CODES]
+    if not unknown:
+        return list(matches)
+    vouched = {m for m, hit in zip(unknown, context_hits(text, unknown, CONTEXT_REGEXES["IFSC"])) if hit}
+    return [m for m in matches if m[2][:4] in IFSC_BANK_CODES or m in vouched]
+
+
+def validate_accounts(text: str, matches: Sequence[Match]) -> List[Match]:
+    """Account numbers with an account/bank keyword nearby, unless a phone keyword closer
+    in front labels them as phone numbers; runs of one repeated digit are dropped."""
+    candidates = [m for m in matches if m[2].count(m[2][0]) != len(m[2])]
+    account = context_distances(text, candidates, CONTEXT_REGEXES["ACCOUNT"])
+    # Labels come before values: a phone keyword after the number belongs to the next one
+    phone = context_distances(text, candidates, PHONE_CONTEXT_REGEX, after=0)
+    return [m for m, a, p in zip(candidates, account, phone) if a is not None and (p is None or a < p)]
+
+
+def validate_passports(text: str, matches: Sequence[Match]) -> List[Match]:
+    """Passport numbers with the word passport nearby."""
+    return [m for m, hit in zip(matches, context_hits(text, matches, CONTEXT_REGEXES["PASSPORT"])) if hit]
+
@@ -1,13 +1,26 @@
 import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import chain, islice
+from typing import Collection, Iterable, Iterator, Optional, Tuple
 from extractors.logger import get_logger
-from extractors.acts_sections import extract_acts_sections
-from extractors.names import extract_names  # 🔹 Robust Indian names via ai4bharat/IndicNER
-from extractors.phone_numbers import extract_phone_numbers
-from extractors.email_ids import extract_emails
-from extractors.pan_gstin import extract_pan_and_gstin
-from extractors.passport import extract_passport_numbers
-from extractors.bank_details import extract_bank_details
-from extractors.address import extract_all_addresses  # ✅ Using your regex-based address.py
+from extractors import names
+from extractors.names import deduplicate_by_substring, resolve_names_batch  # 🔹 Robust Indian names via ai4bharat/IndicNER
+from extractors.address import (AddressBlockDetector, extract_all_addresses, get_address_block_spans,
+                                parse_address_blocks)  # ✅ Using your regex-based address.py
+from extractors.models import models
+from extractors.ner_backends import NER_BACKENDS
+from extractors.pipeline import (EXTRACTORS_BY_NAME, extract_spans_by_extractor, extract_text, extractor_versions,
+                                 stale_extractors)
+from extractors.entity_index import get_entity_index
+from extractors.manifest import file_sha256, get_manifest
+from extractors.metrics import metrics
+from extractors.scheduler import Stage, StagedPipeline
+from extractors.streaming import iter_windows, DEFAULT_WINDOW_CHARS, DEFAULT_OVERLAP_CHARS
+from extractors.results import DocumentResult, ENTITY_FIELDS
+from extractors.sinks import OUTPUT_FORMATS, open_sink
 
 logger = get_logger("Main")
 
@@ -48,40 +61,163 @@ def print_address_components(address):
     ]:
         print(f"- {key}: {components.get(key, '-')}")
 
-def process_file(filepath: str):
+def extract_file(filepath: str, window_chars: int = DEFAULT_WINDOW_CHARS,
+                 overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+                 only: Optional[Collection[str]] = None,
+                 index_path: Optional[str] = None) -> Optional[DocumentResult]:
+    """Run the extractors (all, or those named in ``only``) over one file.
+
+    Returns the findings, or None if the file is empty. Files larger than
+    ``window_chars`` bytes are streamed in overlapping windows (``window_chars=0``
+    always reads the whole file). With ``index_path`` the spans found are also
+    added to that entity index.
+    """
+    try:
+        stream = 0 < window_chars < os.path.getsize(filepath)
+    except OSError:
+        stream = False
+    if stream:
+        return extract_file_streaming(filepath, window_chars, overlap_chars, only, index_path)
+
     logger.info(f"📂 Processing: {filepath}")
     text = read_text_file(filepath)
     if not text.strip():
         logger.warning(f"Empty or unreadable file skipped: {filepath}")
-        return
+        return None
+
+    result = DocumentResult(file=filepath, **extract_text(text, only))
+    if index_path:
+        # The extractors cache their last few texts, so this reuses the run above
+        get_entity_index(index_path).add_document(filepath, extract_spans_by_extractor(text, only))
+    return result
+
+def extract_file_streaming(filepath: str, window_chars: int = DEFAULT_WINDOW_CHARS,
+                           overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+                           only: Optional[Collection[str]] = None,
+                           index_path: Optional[str] = None) -> Optional[DocumentResult]:
+    """Extract from a large file window by window, keeping memory bounded by the window size.
+
+    Entity findings are merged across windows and de-duplicated. Address blocks are
+    detected over the non-overlapping part of each window, line by line, so they come
+    out exactly as in a whole-file run. Indexed spans are those starting in the
+    non-overlapping part, shifted to file offsets.
+    """
+    logger.info(f"📂 Streaming: {filepath}")
+    merged = {}
+    addresses = []
+    detector = AddressBlockDetector()
+    with_addresses = only is None or "addresses" in only
+    has_text = False
+    indexed = {}
+    window_start = 0
+
+    try:
+        for window in iter_windows(filepath, window_chars, overlap_chars):
+            window_start -= window.overlap
+            has_text = has_text or bool(window.new_text.strip())
+            for key, values in extract_text(window.text, only, with_addresses=False).items():
+                merged.setdefault(key, set()).update(values)
+            if index_path:
+                for name, spans in extract_spans_by_extractor(window.text, only).items():
+                    indexed.setdefault(name, []).extend(
+                        span._replace(start=span.start + window_start, end=span.end + window_start)
+                        for span in spans if span.start >= window.overlap
+                    )
+            window_start += len(window.text)
+            if not with_addresses:
+                continue
+
+            blocks = []
+            for line in window.new_text.splitlines():
+                block = detector.feed(line)
+                if block is not None:
+                    blocks.append(block)
+            with metrics.timer("extract.addresses", len(window.new_text.encode("utf-8"))) as measurement:
+                addresses.extend(
+                    {"raw_block": block, "components": components}
+                    for block, components in zip(blocks, parse_address_blocks(blocks))
+                )
+                measurement.entities = len(blocks)
+    except FileNotFoundError:
+        logger.error(f"File not found: {filepath}")
 
-    print(f"\n{'=' * 40}\n📄 File: {os.path.basename(filepath)}\n{'=' * 40}")
+    if not has_text:
+        logger.warning(f"Empty or unreadable file skipped: {filepath}")
+        return None
 
-    # Extraction calls
-    print_results("📘 Acts & Sections Found:", extract_acts_sections(text))
+    if index_path:
+        get_entity_index(index_path).add_document(filepath, indexed)
+    results = {key: sorted(values) for key, values in merged.items()}
+    # Windows overlap, so a name may be cut short in one window and whole in the next
+    for key in ("people", "orgs"):
+        if key in merged:
+            results[key] = deduplicate_by_substring(merged[key])
+    if with_addresses:
+        results["addresses"] = addresses
+    return DocumentResult(file=filepath, **results)
 
-    people, orgs = extract_names(text)
-    print_results("🧑 People Found:", people)
-    print_results("🏢 Organizations Found:", orgs)
+def extract_file_incremental(filepath: str, state_dir: str, **options) -> Optional[DocumentResult]:
+    """Extract a file unless the manifest shows it unchanged since the last run.
 
+    A file whose content hash matches its manifest entry is skipped (None) when every
+    extractor version matches too; otherwise only the extractors whose version changed
+    are re-run and their fields replaced in the stored result. A file missing from the
+    entity index (``index_path`` option) is always fully re-run so it gets indexed.
+    """
+    manifest = get_manifest(state_dir)
+    try:
+        sha256 = file_sha256(filepath)
+    except OSError as e:
+        logger.error(f"Cannot read {filepath}: {e}")
+        return None
 
-    mobiles, landlines = extract_phone_numbers(text)
-    print_results("📱 Mobile Numbers Found:", mobiles)
-    print_results("☎️ Landline Numbers Found:", landlines)
+    entry = manifest.get(filepath)
+    previous = None
+    if entry and entry["sha256"] == sha256:
+        previous = manifest.load_record(entry["output"])
+
+    if previous is None:
+        result = extract_file(filepath, **options)
+    else:
+        stale = stale_extractors(entry["versions"])
+        index_path = options.get("index_path")
+        if index_path and not get_entity_index(index_path).has_document(filepath):
+            stale = list(EXTRACTORS_BY_NAME)
+        if not stale:
+            logger.info(f"⏭️ Unchanged, skipped: {filepath}")
+            return None
 
-    print_results("📧 Email IDs Found:", extract_emails(text))
+        logger.info(f"♻️ Re-running {', '.join(stale)} on unchanged file: {filepath}")
+        fresh = extract_file(filepath, only=stale, **options)
+        result = previous
+        result.file = filepath
+        if fresh is not None:
+            for name in stale:
+                for field in EXTRACTORS_BY_NAME[name].fields:
+                    setattr(result, field, getattr(fresh, field))
 
-    pans, gstins = extract_pan_and_gstin(text)
-    print_results("🧾 PAN Numbers Found:", pans)
-    print_results("🧾 GSTINs Found:", gstins)
+    if result is None:
+        return None
+    output = manifest.save_record(sha256, result)
+    manifest.update(filepath, sha256, extractor_versions(), output)
+    return result
 
-    print_results("🛂 Passport Numbers Found:", extract_passport_numbers(text))
+def report_results(result: DocumentResult):
+    print(f"\n{'=' * 40}\n📄 File: {os.path.basename(result.file)}\n{'=' * 40}")
 
-    accounts, ifscs = extract_bank_details(text)
-    print_results("🏦 Account Numbers Found:", accounts)
-    print_results("🏦 IFSC Codes Found:", ifscs)
+    print_results("📘 Acts & Sections Found:", result.acts)
+    print_results("🧑 People Found:", result.people)
+    print_results("🏢 Organizations Found:", result.orgs)
+    print_results("📱 Mobile Numbers Found:", result.mobiles)
+    print_results("☎️ Landline Numbers Found:", result.landlines)
+    print_results("📧 Email IDs Found:", result.emails)
+    print_results("🧾 PAN Numbers Found:", result.pans)
+    print_results("🧾 GSTINs Found:", result.gstins)
+    print_results("🛂 Passport Numbers Found:", result.passports)
+    print_results("🏦 Account Numbers Found:", result.accounts)
+    print_results("🏦 IFSC Codes Found:", result.ifscs)
 
-    addresses = extract_all_addresses(text)
+    addresses = result.addresses
     if addresses:
         for i, address in enumerate(addresses, 1):
             print(f"\n🏷️ Address Block {i}")
@@ -89,22 +225,251 @@ def process_file(filepath: str):
     else:
         print("\n📍 No structured addresses found.")
 
-def main():
-    folder_path = "files"
+def run_file(filepath: str, state_dir: Optional[str] = None, **options) -> Optional[DocumentResult]:
+    """extract_file, or its incremental form when a manifest state directory is given.
+
+    The whole document is timed in the process-wide metrics.
+    """
+    try:
+        nbytes = os.path.getsize(filepath)
+    except OSError:
+        nbytes = 0
+    with metrics.document(filepath, nbytes) as record:
+        if state_dir:
+            result = extract_file_incremental(filepath, state_dir, **options)
+        else:
+            result = extract_file(filepath, **options)
+        if result is not None:
+            record["entities"] = sum(len(getattr(result, name)) for name in ENTITY_FIELDS) + len(result.addresses)
+    return result
+
+def run_file_in_worker(filepath: str, **options) -> Tuple[Optional[DocumentResult], dict]:
+    """run_file for pool workers: also ships the worker's metrics back to the parent."""
+    result = run_file(filepath, **options)
+    if options.get("index_path"):
+        # Workers never get a shutdown hook, so each document is committed as it finishes
+        get_entity_index(options["index_path"]).flush()
+    return result, metrics.drain()
+
+def process_file(filepath: str, **options):
+    result = run_file(filepath, **options)
+    if result is not None:
+        report_results(result)
+
+def iter_txt_files(folder_path: str) -> Iterator[str]:
+    """Yield .txt paths lazily so huge directories are never listed into memory at once."""
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".txt") and entry.is_file():
+                yield entry.path
+
+def init_worker(workers: int, ner_backend: Optional[str] = None, names_mode: Optional[str] = None):
+    """Process pool initializer: bound inference threads per worker and load the NER models once."""
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    models.configure(indic_backend=ner_backend, threads=threads)
+    if names_mode:
+        names.set_names_mode(names_mode)
+    if names.NAMES_MODE != "fast":
+        models.load_all()
+
+def extract_files_parallel(file_paths: Iterable[str], workers: int, max_in_flight: int,
+                           **options) -> Iterator[Tuple[str, Optional[DocumentResult]]]:
+    """Spread files over a process pool and yield (path, result) in completion order.
+
+    At most ``max_in_flight`` files are submitted at any time, so memory stays bounded
+    however many files the input holds. ``options`` are passed on to ``run_file``.
+    """
+    paths = iter(file_paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(workers, models.indic_backend, names.NAMES_MODE)) as pool:
+        pending = {pool.submit(run_file_in_worker, path, **options): path for path in islice(paths, max_in_flight)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    results, worker_metrics = future.result()
+                    metrics.merge(worker_metrics)
+                except Exception as e:
+                    logger.error(f"Extraction failed for {path}: {e}")
+                    results = None
+                yield path, results
+
+                for next_path in islice(paths, 1):
+                    pending[pool.submit(run_file_in_worker, next_path, **options)] = next_path
+
+def extract_files_staged(file_paths: Iterable[str], read_workers: int = 2, regex_workers: int = 1,
+                         ner_batch_size: int = 8, address_workers: int = 4,
+                         window_chars: int = DEFAULT_WINDOW_CHARS, overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+                         index_path: Optional[str] = None) -> Iterator[Optional[DocumentResult]]:
+    """Run files through read -> regex -> NER -> address stages that all work at once.
+
+    Reading uses I/O threads, the regex extractors a CPU thread, NER one thread feeding
+    batches of ``ner_batch_size`` documents to the models, and address parsing several
+    threads so LLM round trips overlap. Results come out in completion order and the
+    per-stage throughput table is printed to stderr at the end.
+    """
+    regex_names = [name for name in EXTRACTORS_BY_NAME if name not in ("names", "addresses")]
+
+    def read(jobs):
+        for job in jobs:
+            try:
+                job.nbytes = os.path.getsize(job.item)
+            except OSError:
+                job.nbytes = 0
+            if 0 < window_chars < job.nbytes:
+                # Too large to hold whole; stream it here and let it pass the later stages
+                job.result = extract_file_streaming(job.item, window_chars, overlap_chars, index_path=index_path)
+                job.skip = True
+                continue
+            job.text = read_text_file(job.item)
+            if not job.text.strip():
+                logger.warning(f"Empty or unreadable file skipped: {job.item}")
+                job.skip = True
+
+    def regex(jobs):
+        for job in jobs:
+            job.fields.update(extract_text(job.text, regex_names))
+            if index_path:
+                job.spans.update(extract_spans_by_extractor(job.text, regex_names))
+
+    def ner(jobs):
+        with metrics.timer("extract.names", sum(job.nbytes for job in jobs)) as measurement:
+            resolved = resolve_names_batch([job.text for job in jobs])
+            measurement.entities = sum(len(people) + len(orgs) for people, orgs, _ in resolved)
+        for job, (people, orgs, spans) in zip(jobs, resolved):
+            job.fields.update(people=list(people), orgs=list(orgs))
+            if index_path:
+                job.spans["names"] = list(spans)
+
+    def addresses(jobs):
+        for job in jobs:
+            with metrics.timer("extract.addresses", job.nbytes) as measurement:
+                job.fields["addresses"] = extract_all_addresses(job.text)
+                measurement.entities = len(job.fields["addresses"])
+            if index_path:
+                job.spans["addresses"] = get_address_block_spans(job.text)
+
+    pipeline = StagedPipeline([
+        Stage("read", read, read_workers),
+        Stage("regex", regex, regex_workers),
+        Stage("ner", ner, 1, batch_size=ner_batch_size, max_wait=0.02),
+        Stage("addresses", addresses, address_workers),
+    ])
+    for job in pipeline.run(file_paths):
+        if job.error is not None:
+            logger.error(f"Extraction failed for {job.item}: {job.error}")
+            yield None
+        elif job.skip:
+            yield job.result
+        else:
+            if index_path:
+                get_entity_index(index_path).add_document(job.item, job.spans)
+            yield DocumentResult(file=job.item, **job.fields)
+    print(f"\n{pipeline.summary_table()}", file=sys.stderr, flush=True)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract entities from legal text files.")
+    parser.add_argument("folder", nargs="?", default="files", help="Folder containing .txt files")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes (1 runs in-process)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Max files queued to the pool at once (default: 2 x workers)")
+    parser.add_argument("--window-mb", type=float, default=DEFAULT_WINDOW_CHARS / 2**20,
+                        help="Stream files larger than this in windows of this size (0 disables streaming)")
+    parser.add_argument("--overlap-kb", type=float, default=DEFAULT_OVERLAP_CHARS / 2**10,
+                        help="Overlap between consecutive streaming windows")
+    parser.add_argument("--state-dir", default=None,
+                        help="Incremental mode: keep a manifest and stored results here, skip unchanged "
+                             "files and re-run only extractors whose version changed")
+    parser.add_argument("--ner-backend", choices=NER_BACKENDS, default=None,
+                        help="IndicNER inference backend (default: $INDIC_NER_BACKEND or torch); "
+                             "onnx and onnx-int8 need onnxruntime and export the model on first use")
+    parser.add_argument("--names-mode", choices=names.NAMES_MODES, default=None,
+                        help="hybrid runs IndicNER and Flair; fast finds people from honorifics and a name "
+                             "gazetteer with no model (default: $NAMES_MODE or hybrid)")
+    parser.add_argument("--metrics", default=None,
+                        help="Write per-stage and per-document timings to this JSON file")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="Output format: human-readable text, or one record per document")
+    parser.add_argument("--output", default=None,
+                        help="Output file for jsonl/csv/parquet (default: stdout; required for parquet)")
+    parser.add_argument("--staged", action="store_true",
+                        help="Run reading, regex extraction, NER and address parsing as concurrent stages "
+                             "joined by bounded queues (in-process; not with --workers or --state-dir)")
+    parser.add_argument("--read-workers", type=int, default=2, help="Staged mode: file reading threads")
+    parser.add_argument("--regex-workers", type=int, default=1, help="Staged mode: regex extraction threads")
+    parser.add_argument("--ner-batch", type=int, default=8, help="Staged mode: documents per NER batch")
+    parser.add_argument("--address-workers", type=int, default=4,
+                        help="Staged mode: threads parsing addresses, i.e. documents waiting on the LLM at once")
+    parser.add_argument("--index", default=None,
+                        help="Add every entity found, with its offsets, to this SQLite entity index "
+                             "(query it with python -m extractors.entity_index)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    folder_path = args.folder
     logger.info("🚀 Starting extraction pipeline...")
 
     if not os.path.exists(folder_path):
         logger.error(f"Folder not found: {folder_path}")
         return
 
-    txt_files = [os.path.join(folder_path, f) for f in os.listdir(folder_path) if f.endswith(".txt")]
+    if args.staged and (args.workers > 1 or args.state_dir):
+        logger.error("--staged runs in one process and cannot be combined with --workers or --state-dir")
+        return
 
-    if not txt_files:
+    txt_files = iter_txt_files(folder_path)
+    first = next(txt_files, None)
+    if first is None:
         logger.warning(f"No .txt files found in {folder_path}")
         return
+    txt_files = chain([first], txt_files)
+    if args.ner_backend:
+        models.configure(indic_backend=args.ner_backend)
+    if args.names_mode:
+        names.set_names_mode(args.names_mode)
+    options = {"window_chars": int(args.window_mb * 2**20), "overlap_chars": int(args.overlap_kb * 2**10),
+               "state_dir": args.state_dir, "index_path": args.index}
+
+    sink = open_sink(args.format, args.output) if args.format != "text" else None
+    write = sink.write if sink else report_results
+    run_start = time.perf_counter()
+
+    try:
+        if args.staged:
+            results = extract_files_staged(txt_files, args.read_workers, args.regex_workers, args.ner_batch,
+                                           args.address_workers, options["window_chars"], options["overlap_chars"],
+                                           args.index)
+        elif args.workers <= 1:
+            results = (run_file(file_path, **options) for file_path in txt_files)
+        else:
+            max_in_flight = args.max_in_flight or 2 * args.workers
+            results = (result for _, result in
+                       extract_files_parallel(txt_files, args.workers, max_in_flight, **options))
+
+        for result in results:
+            if result is not None:
+                write(result)
+    finally:
+        if sink:
+            sink.close()
+        if args.index:
+            get_entity_index(args.index).close()
+        report_metrics(args, time.perf_counter() - run_start)
 
-    for file_path in txt_files:
-        process_file(file_path)
+def report_metrics(args: argparse.Namespace, wall: float):
+    """Print the per-stage summary table to stderr and optionally write the metrics file."""
+    print(f"\n⏱️ Run finished in {wall:.2f}s\n{metrics.summary_table()}", file=sys.stderr, flush=True)
+    if args.metrics:
+        metrics.write_json(args.metrics, wall=wall, folder=args.folder, workers=args.workers)
+        logger.info(f"Metrics written to {args.metrics}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,107 @@
+"""Shared fixtures: stand-in NER models, so the names pipeline runs without downloading any.
+
+The IndicNER stand-in labels words from fixed lists (B-PER / I-PER), whatever their
+context, through the same tokenizer/runner interface as the real backends. The Flair
+stand-in tags nothing.
+"""
+import importlib.util
+import re
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from extractors import names
+from extractors.models import models
+
+TOKEN_REGEX = re.compile(r"\w+|[^\w\s]")
+ID2LABEL = {0: "O", 1: "B-PER", 2: "I-PER"}
+PAD, CLS, SEP = 0, 1, 2
+
+
+class StubTokenizer:
+    is_fast = True
+
+    def __init__(self):
+        self.vocab = {}
+        self.words = ["[PAD]", "[CLS]", "[SEP]"]
+
+    def _id(self, word):
+        if word not in self.vocab:
+            self.vocab[word] = len(self.words)
+            self.words.append(word)
+        return self.vocab[word]
+
+    def __call__(self, texts, truncation, max_length, stride, return_overflowing_tokens, return_offsets_mapping):
+        encoded = {"input_ids": [], "attention_mask": [], "offset_mapping": [], "overflow_to_sample_mapping": []}
+        body = max_length - 2
+        for owner, text in enumerate(texts):
+            tokens = [(m.group(0), m.span()) for m in TOKEN_REGEX.finditer(text)]
+            pos = 0
+            while True:
+                window = tokens[pos:pos + body]
+                encoded["input_ids"].append([CLS] + [self._id(word) for word, _ in window] + [SEP])
+                encoded["attention_mask"].append([1] * (len(window) + 2))
+                encoded["offset_mapping"].append([(0, 0)] + [span for _, span in window] + [(0, 0)])
+                encoded["overflow_to_sample_mapping"].append(owner)
+                if not return_overflowing_tokens or pos + body >= len(tokens):
+                    break
+                pos += body - stride
+        return encoded
+
+    def pad(self, batch, return_tensors):
+        width = max(len(ids) for ids in batch["input_ids"])
+        return {key: np.array([row + [PAD] * (width - len(row)) for row in rows]) for key, rows in batch.items()}
+
+
+class StubRunner:
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.begin = set()
+        self.inside = set()
+
+    def predict(self, input_ids, attention_mask):
+        words = self.tokenizer.words
+        return np.array([[1 if words[i] in self.begin else 2 if words[i] in self.inside else 0 for i in row]
+                         for row in input_ids])
+
+
+class StubTagger:
+    def predict(self, sentences, mini_batch_size):
+        pass
+
+
+def _install_flair_data():
+    """Minimal flair.data.Sentence for machines without flair; the stub tagger never labels it."""
+    if importlib.util.find_spec("flair") is not None:
+        return
+    data = types.ModuleType("flair.data")
+
+    class Sentence:
+        def __init__(self, words):
+            self.words = words
+
+        def get_spans(self, label_type):
+            return []
+
+    data.Sentence = Sentence
+    flair = types.ModuleType("flair")
+    flair.data = data
+    sys.modules.setdefault("flair", flair)
+    sys.modules.setdefault("flair.data", data)
+
+
+@pytest.fixture
+def stub_ner(monkeypatch):
+    """Install the stand-in models; returns the runner, whose ``begin``/``inside`` word sets drive the labels."""
+    _install_flair_data()
+    tokenizer = StubTokenizer()
+    runner = StubRunner(tokenizer)
+    monkeypatch.setitem(models._models, f"indic.{models.indic_backend}", (tokenizer, runner, ID2LABEL))
+    monkeypatch.setitem(models._models, "flair", StubTagger())
+    names.chunk_memo.clear()
+    names._resolve_names.cache_clear()
+    yield runner
+    names.chunk_memo.clear()
+    names._resolve_names.cache_clear()
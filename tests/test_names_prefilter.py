@@ -0,0 +1,71 @@
+import pytest
+
+from extractors import names
+
+MODES = ("windows", "chunks")
+
+
+def resolve(text, mode, prefilter):
+    return names.resolve_names_batch([text], mode=mode, prefilter=prefilter)[0]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_line_wrapped_name_survives_the_gate(stub_ner, mode):
+    stub_ner.begin.update({"Ramesh"})
+    stub_ner.inside.update({"Verma"})
+    text = ("Reference number one.\nThe order dated today was signed by Shri Ramesh\n"
+            "Verma on behalf of the noticee firm.\n")
+    unfiltered = resolve(text, mode, prefilter=False)
+    names.chunk_memo.clear()
+    assert resolve(text, mode, prefilter=True) == unfiltered
+    if mode == "windows":
+        assert unfiltered[0] == ("Ramesh Verma",)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_name_split_at_initials_survives_the_gate(stub_ner, mode):
+    stub_ner.begin.update({"R"})
+    stub_ner.inside.update({".", "Devi"})
+    text = "The appeal was heard in the presence of the other party. Smt. R. Devi was present on the day of hearing."
+    unfiltered = resolve(text, mode, prefilter=False)
+    names.chunk_memo.clear()
+    assert resolve(text, mode, prefilter=True) == unfiltered
+
+
+def test_sentences_without_name_candidates_are_skipped(stub_ner):
+    text = "Rajesh Sharma Appeared Today.\nthe amount was paid in full and no dues remain.\npaid vide cheque 12345 67 890."
+    before = names.prefilter_stats.snapshot()
+    resolve(text, "windows", prefilter=True)
+    after = names.prefilter_stats.snapshot()
+    assert after["skipped"] - before["skipped"] == 2
+
+
+def test_repeats_in_one_batch_do_not_depend_on_the_memo(stub_ner, monkeypatch):
+    stub_ner.begin.update({"Ramesh"})
+    stub_ner.inside.update({"Kumar", "Sharma"})
+    sentence = "The appeal was filed by Ramesh Kumar Sharma before the Court."
+    texts = ["Preliminary Matters Were Heard today. " + sentence, "Nothing of note here. " + sentence]
+    monkeypatch.setattr(names.chunk_memo, "size", 0)
+    results = names.resolve_names_batch(texts, prefilter=True)
+    assert [people for people, _, _ in results] == [("Ramesh Kumar Sharma",)] * 2
+
+
+CROSSING_TEXT = "The notice was served on Ramesh. Verma was absent from the hearing, said the Counsel."
+
+
+def test_entity_crossing_sentences_survives_warm_rerun(stub_ner):
+    stub_ner.begin.update({"Ramesh"})
+    stub_ner.inside.update({".", "Verma"})
+    unfiltered = resolve(CROSSING_TEXT, "windows", prefilter=False)
+    cold = resolve(CROSSING_TEXT, "windows", prefilter=True)
+    warm = resolve(CROSSING_TEXT, "windows", prefilter=True)
+    assert unfiltered[0]
+    assert cold == warm == unfiltered
+
+
+def test_entity_crossing_sentences_survives_in_batch_repeat(stub_ner):
+    stub_ner.begin.update({"Ramesh"})
+    stub_ner.inside.update({".", "Verma"})
+    unfiltered = resolve(CROSSING_TEXT, "windows", prefilter=False)
+    results = names.resolve_names_batch([CROSSING_TEXT, CROSSING_TEXT], mode="windows", prefilter=True)
+    assert results == [unfiltered, unfiltered]
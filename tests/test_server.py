@@ -0,0 +1,57 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from extractors.server import ExtractionService, make_server
+
+
+@pytest.fixture
+def service():
+    service = ExtractionService()
+    yield service
+    service.batcher.close()
+
+
+@pytest.fixture
+def post(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def post(body: bytes):
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        connection.request("POST", "/extract", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        result = response.status, json.loads(response.read())
+        connection.close()
+        return result
+
+    yield post
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("only", ["names", ["names", 3], 7])
+def test_only_must_be_a_list_of_names(service, only):
+    with pytest.raises(ValueError, match="only must be a list"):
+        service.extract("Some text.", only=only)
+
+
+def test_unknown_extractor_is_rejected(service):
+    with pytest.raises(ValueError, match="Unknown extractors: nope"):
+        service.extract("Some text.", only=["nope"])
+
+
+@pytest.mark.parametrize("body", [b'["text"]', b'"text"', b"42", b"null"])
+def test_non_object_body_is_a_bad_request(post, body):
+    status, response = post(body)
+    assert status == 400
+    assert "JSON object" in response["error"]
+
+
+def test_string_only_is_a_bad_request(post):
+    status, response = post(json.dumps({"text": "Some text.", "only": "names"}).encode())
+    assert status == 400
+    assert "only must be a list" in response["error"]